@@ -227,7 +227,8 @@ class QemuController(Controller):
 
         See base method for details.
         """
-        xpos, ypos, width, height, filename = self._region_from_args(*args)
+        xpos, ypos, width, height = self._clip_region(*args)
+        filename = self._temporary_filename()
         # TODO: capture subregion not present - own implementation?
         self._backend_obj.screendump(filename=filename, debug=True)
         with PIL.Image.open(filename) as pil_image:
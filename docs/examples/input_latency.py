@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+# Only needed if not installed system wide
+import sys
+sys.path.insert(0, '../..')
+
+
+# Program start here
+#
+# Send the same sequence of input events through the subprocess
+# xdotool input and through the in-process XTest input of the XDO
+# controller, then report the average latency of each event type.
+# The main purpose of this sample is to be reused as a tool for
+# comparing the input latency of the available input methods on a
+# given X display.
+
+
+import logging
+import time
+
+from guibot.config import GlobalConfig
+from guibot.controller import XDoToolController
+from guibot.location import Location
+
+
+# Parameters to toy with
+INPUT_METHODS = ["xdotool", "xtest"]
+REPETITIONS = 20
+LOCATIONS = [Location(100, 100), Location(200, 150)]
+TEXT = "Hello world!"
+
+
+# Overall logging setup
+handler = logging.StreamHandler()
+logging.getLogger('').addHandler(handler)
+logging.getLogger('').setLevel(logging.INFO)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+handler.setFormatter(formatter)
+GlobalConfig.image_logging_level = logging.ERROR
+
+
+def timed(action, *args, **kwargs):
+    """Average duration of a repeated action in milliseconds."""
+    start_time = time.time()
+    for _ in range(REPETITIONS):
+        action(*args, **kwargs)
+    return (time.time() - start_time) / REPETITIONS * 1000
+
+
+# Main steps: benchmark each input method with identical events
+results = {}
+for method in INPUT_METHODS:
+    display = XDoToolController(synchronize=False)
+    display.params["xdotool"]["input"] = method
+    display.synchronize_backend()
+    # remove any fixed delays to only measure the input method itself
+    display.params["control"]["mouse_toggle_delay"] = 0.0
+    display.params["control"]["after_click_delay"] = 0.0
+    display.params["control"]["delay_before_keys"] = 0.0
+
+    results[method] = {
+        "mouse location": timed(lambda: display.mouse_location),
+        "mouse move": timed(lambda: [display.mouse_move(l, smooth=False)
+                                     for l in LOCATIONS]) / len(LOCATIONS),
+        "mouse down/up": timed(lambda: (display.mouse_down(display.mousemap.LEFT_BUTTON),
+                                        display.mouse_up(display.mousemap.LEFT_BUTTON))),
+        "key toggle": timed(lambda: (display.keys_toggle([display.keymap.SHIFT], True),
+                                     display.keys_toggle([display.keymap.SHIFT], False))),
+        "text typing": timed(display.keys_type, [TEXT]) / len(TEXT),
+    }
+
+for event in results[INPUT_METHODS[0]]:
+    logging.info("%-15s %s", event, "  ".join("%s: %8.2f ms" % (method, results[method][event])
+                                             for method in INPUT_METHODS))
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+# Only needed if not installed system wide
+import sys
+sys.path.insert(0, '../..')
+
+
+# Program start here
+#
+# Load images/shape_blue_circle.png as a needle and repeat it
+# in a grid of hundreds of icons (like a grid view or a spreadsheet)
+# as a haystack, then find all needles in the haystack with both
+# the iterative and the vectorized peak extraction of the template
+# matching and compare their matches and average duration. The main
+# purpose of this sample is to be reused as a tool for benchmarking
+# multiple matches on large haystacks with many repeated targets.
+
+
+import logging
+import time
+
+import numpy
+
+from guibot.config import GlobalConfig
+from guibot.fileresolver import FileResolver
+from guibot.target import Image
+from guibot.finder import TemplateFinder
+
+
+# Parameters to toy with
+file_resolver = FileResolver()
+file_resolver.add_path('images/')
+NEEDLE = Image('shape_blue_circle')
+ROWS, COLUMNS = 15, 20
+SPACING = 10
+SIMILARITY = 0.9
+REPETITIONS = 5
+
+
+# Overall logging setup
+handler = logging.StreamHandler()
+logging.getLogger('').addHandler(handler)
+logging.getLogger('').setLevel(logging.INFO)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+handler.setFormatter(formatter)
+GlobalConfig.image_logging_level = logging.ERROR
+
+
+# Main configuration steps
+icon = NEEDLE.numpy_array
+cell_height, cell_width = icon.shape[0] + SPACING, icon.shape[1] + SPACING
+grid = numpy.full((ROWS * cell_height, COLUMNS * cell_width, 3), 255, dtype=numpy.uint8)
+for row in range(ROWS):
+    for col in range(COLUMNS):
+        y, x = row * cell_height, col * cell_width
+        grid[y:y + icon.shape[0], x:x + icon.shape[1]] = icon
+HAYSTACK = Image("", numpy_array=grid)
+finder = TemplateFinder()
+finder.params["find"]["similarity"].value = SIMILARITY
+
+
+# Main steps: benchmark each peak extraction with identical matching
+results = {}
+for peaks in ["iterative", "vectorized"]:
+    finder.params["template"]["peaks"].value = peaks
+    start_time = time.time()
+    for _ in range(REPETITIONS):
+        matches = finder.find(NEEDLE, HAYSTACK)
+    duration = (time.time() - start_time) / REPETITIONS
+    results[peaks] = [(m.x, m.y, m.similarity) for m in matches]
+    logging.info("%-10s peak extraction found %s matches in %.2f ms",
+                 peaks, len(matches), duration * 1000)
+
+logging.info("Identical matches: %s", results["iterative"] == results["vectorized"])
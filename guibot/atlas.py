@@ -0,0 +1,172 @@
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Persistent atlas of target locations across separate runs.
+
+SUMMARY
+------------------------------------------------------
+
+An atlas file stores the last match box and similarity of targets keyed by
+the hash of the target file, the screen resolution, and the searched region.
+Static targets (e.g. toolbar buttons) found at the same place in every run
+can then be verified at their previous location with a single small screen
+capture before falling back to searching the entire region.
+
+INTERFACE
+------------------------------------------------------
+
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from tempfile import NamedTemporaryFile
+from typing import Any
+
+log = logging.getLogger("guibot.atlas")
+__all__ = ["LocationAtlas"]
+
+
+class LocationAtlas(object):
+    """Atlas of target locations persisted in a file."""
+
+    # atlases shared among all regions for each file
+    _atlases: dict[str, "LocationAtlas"] = {}
+    _atlases_lock = threading.Lock()
+
+    @staticmethod
+    def from_file(filename: str) -> "LocationAtlas":
+        """
+        Obtain the atlas persisted in a file shared among all its users.
+
+        :param filename: name of the atlas file
+        :returns: atlas loaded from the file if it exists or a new empty one
+        """
+        filename = os.path.abspath(filename)
+        with LocationAtlas._atlases_lock:
+            if filename not in LocationAtlas._atlases:
+                LocationAtlas._atlases[filename] = LocationAtlas(filename)
+            return LocationAtlas._atlases[filename]
+
+    def __init__(self, filename: str) -> None:
+        """
+        Build a location atlas persisted in a file.
+
+        :param filename: name of the atlas file
+        """
+        self.filename = filename
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._hashes: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(filename):
+            try:
+                with open(filename) as f:
+                    entries = json.load(f)
+                if not isinstance(entries, dict):
+                    raise ValueError("Atlas is not a JSON object")
+            except (OSError, ValueError) as error:
+                # locations are only an optimization so start anew without them
+                log.warning("Could not load the location atlas %s: %s", filename, error)
+            else:
+                self._entries = entries
+                log.debug("Loaded %i atlas locations from %s", len(self), filename)
+
+    def __len__(self) -> int:
+        """Provide the number of stored locations."""
+        return len(self._entries)
+
+    def key(
+        self,
+        target_filename: str,
+        screen_size: tuple[int, int],
+        region: tuple[int, int, int, int],
+    ) -> str:
+        """
+        Generate the atlas key for a target searched within a screen region.
+
+        :param target_filename: name of the target file (hashed by content)
+        :param screen_size: width and height of the screen
+        :param region: x, y, width, and height of the searched region
+        :returns: key of the target location in the atlas
+        """
+        mtime = os.path.getmtime(target_filename)
+        with self._lock:
+            last_mtime, digest = self._hashes.get(target_filename, (None, None))
+        if last_mtime != mtime:
+            with open(target_filename, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            with self._lock:
+                self._hashes[target_filename] = (mtime, digest)
+        return "%s %sx%s %s,%s,%s,%s" % (digest, *screen_size, *region)
+
+    def lookup(self, key: str) -> tuple[tuple[int, int, int, int], float] | None:
+        """
+        Look up the last location of a target.
+
+        :param key: key of the target location in the atlas
+        :returns: last match box (x, y, width, height) and similarity or None
+                  if the target was never matched
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+        if entry is None:
+            return None
+        return tuple(entry["box"]), entry["similarity"]
+
+    def update(
+        self, key: str, box: tuple[int, int, int, int], similarity: float
+    ) -> None:
+        """
+        Store the location of a target and persist the atlas if it moved.
+
+        :param key: key of the target location in the atlas
+        :param box: match box (x, y, width, height) of the target
+        :param similarity: similarity of the match
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and tuple(entry["box"]) == tuple(box):
+                entry["similarity"] = similarity
+                entry["time"] = time.time()
+                # persisting the same location again is not worth it
+                return
+            self._entries[key] = {
+                "box": list(box),
+                "similarity": similarity,
+                "time": time.time(),
+            }
+            # write atomically through a temporary file of this process to never
+            # leave a broken atlas file behind even with concurrent sessions
+            temp_filename = None
+            try:
+                with NamedTemporaryFile(
+                    "w",
+                    dir=os.path.dirname(os.path.abspath(self.filename)),
+                    prefix=os.path.basename(self.filename),
+                    suffix=".tmp",
+                    delete=False,
+                ) as f:
+                    temp_filename = f.name
+                    json.dump(self._entries, f, indent=4)
+                os.replace(temp_filename, self.filename)
+            except OSError as error:
+                log.warning("Could not save the location atlas: %s", error)
+                if temp_filename is not None and os.path.exists(temp_filename):
+                    os.unlink(temp_filename)
@@ -0,0 +1,484 @@
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Screen capture providers decoupled from the display controllers.
+
+SUMMARY
+------------------------------------------------------
+
+A capture provider is only responsible for grabbing pixels from a screen and
+can be paired with any display controller, e.g. in order to combine the input
+of one backend with the faster screen capture of another.
+
+INTERFACE
+------------------------------------------------------
+
+"""
+
+import time
+import logging
+import threading
+import numpy
+
+from .target import Image
+from .errors import *
+
+log = logging.getLogger("guibot.capture")
+__all__ = [
+    "CaptureProvider",
+    "X11CaptureProvider",
+    "MSSCaptureProvider",
+    "VNCCaptureProvider",
+    "capture_provider",
+]
+
+
+class CaptureProvider(object):
+    """
+    Screen capture backend, responsible only for grabbing screen regions.
+
+    Each capture is timed so that the latency of the provider can be
+    monitored and compared to the latency of other providers.
+    """
+
+    def __init__(self) -> None:
+        """Build a screen capture provider."""
+        self._width = 0
+        self._height = 0
+
+        self._last_latency = 0.0
+        self._total_latency = 0.0
+        self._captures = 0
+
+    def get_width(self) -> int:
+        """
+        Getter for readonly attribute.
+
+        :returns: width of the captured screen
+        """
+        return self._width
+
+    width = property(fget=get_width)
+
+    def get_height(self) -> int:
+        """
+        Getter for readonly attribute.
+
+        :returns: height of the captured screen
+        """
+        return self._height
+
+    height = property(fget=get_height)
+
+    def get_last_latency(self) -> float:
+        """
+        Getter for readonly attribute.
+
+        :returns: duration of the last capture in seconds
+        """
+        return self._last_latency
+
+    last_latency = property(fget=get_last_latency)
+
+    def get_mean_latency(self) -> float:
+        """
+        Getter for readonly attribute.
+
+        :returns: average duration of all captures so far in seconds
+        """
+        if self._captures == 0:
+            return 0.0
+        return self._total_latency / self._captures
+
+    mean_latency = property(fget=get_mean_latency)
+
+    def connect(self) -> None:
+        """
+        Connect to the screen and obtain its size.
+
+        :raises: :py:class:`NotImplementedError` if the base class method is called
+        """
+        raise NotImplementedError(
+            "Method is not available for this capture implementation"
+        )
+
+    def disconnect(self) -> None:
+        """Release any resources held for the screen connection."""
+        pass
+
+    def capture(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Get a region of the current screen as image.
+
+        :param xpos: x coordinate of the upleft vertex of the region
+        :param ypos: y coordinate of the upleft vertex of the region
+        :param width: width of the region
+        :param height: height of the region
+        :returns: image of the screen region
+        """
+        start_time = time.time()
+        image = self.grab(xpos, ypos, width, height)
+        self._last_latency = time.time() - start_time
+        self._total_latency += self._last_latency
+        self._captures += 1
+        log.log(
+            9,
+            "Captured %sx%s region with %s in %.2f ms",
+            width,
+            height,
+            self.__class__.__name__,
+            self._last_latency * 1000,
+        )
+        return image
+
+    def grab(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Grab the pixels of a screen region without any accounting.
+
+        :param xpos: x coordinate of the upleft vertex of the region
+        :param ypos: y coordinate of the upleft vertex of the region
+        :param width: width of the region
+        :param height: height of the region
+        :returns: image of the screen region
+        :raises: :py:class:`NotImplementedError` if the base class method is called
+        """
+        raise NotImplementedError(
+            "Method is not available for this capture implementation"
+        )
+
+
+class X11CaptureProvider(CaptureProvider):
+    """
+    Screen capture backend implemented through python-xlib.
+
+    The provider keeps a persistent X display connection and reads each
+    region directly from the X server framebuffer. The connection is shared
+    by all providers of the same X display so that display controllers can
+    also reuse it for their input and pointer queries and is thus opened in
+    the thread-safe mode of python-xlib.
+    """
+
+    # X display connections, their reference counts, and their locks for
+    # sequences of requests that must not be interleaved per display name
+    _connections: dict[str | None, "xdisplay.Display"] = {}
+    _references: dict[str | None, int] = {}
+    _locks: dict[str | None, threading.RLock] = {}
+    _connections_lock = threading.Lock()
+
+    def __init__(self, display: str = None) -> None:
+        """
+        Build a capture provider using python-xlib.
+
+        :param display: name of the X display or None for the current one
+        """
+        super(X11CaptureProvider, self).__init__()
+        self._display_name = display
+        self._display = None
+        self._lock: threading.RLock = None
+        # byte order of the color channels in each 32-bit pixel if any
+        self._pixel_layout: str = None
+
+    def get_display(self) -> "xdisplay.Display":
+        """
+        Getter for readonly attribute.
+
+        :returns: X display connection shared by all providers of the display
+        """
+        return self._display
+
+    display = property(fget=get_display)
+
+    def get_lock(self) -> threading.RLock:
+        """
+        Getter for readonly attribute.
+
+        :returns: lock shared by all users of the X display connection that
+                  has to be held for any requests over the connection (e.g.
+                  input and pointer queries while capturing in the background)
+        """
+        return self._lock
+
+    lock = property(fget=get_lock)
+
+    def get_direct_grab(self) -> bool:
+        """
+        Getter for readonly attribute.
+
+        :returns: whether regions can be grabbed directly from the framebuffer
+                  which is only supported for displays with 32 bits per pixel
+        """
+        return self._pixel_layout is not None
+
+    direct_grab = property(fget=get_direct_grab)
+
+    def connect(self) -> None:
+        """
+        Connect to the screen and obtain its size.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        # the shared connection is used from multiple threads and python-xlib
+        # only locks its request and reply streams after this import
+        import Xlib.threaded
+        from Xlib import display as xdisplay
+
+        self.disconnect()
+        with self._connections_lock:
+            if self._display_name not in self._connections:
+                self._connections[self._display_name] = xdisplay.Display(
+                    self._display_name
+                )
+                self._references[self._display_name] = 0
+                self._locks[self._display_name] = threading.RLock()
+            self._references[self._display_name] += 1
+            self._display = self._connections[self._display_name]
+            self._lock = self._locks[self._display_name]
+        screen = self._display.screen()
+        self._width = screen.width_in_pixels
+        self._height = screen.height_in_pixels
+
+        from Xlib import X
+
+        info = self._display.display.info
+        bits_per_pixel = 0
+        for pixmap_format in info.pixmap_formats:
+            if pixmap_format.depth == screen.root_depth:
+                bits_per_pixel = pixmap_format.bits_per_pixel
+        if screen.root_depth not in (24, 32) or bits_per_pixel != 32:
+            log.warning(
+                "Direct screen grabbing is not supported for X displays with"
+                " depth %s and %s bits per pixel",
+                screen.root_depth,
+                bits_per_pixel,
+            )
+            self._pixel_layout = None
+        elif info.image_byte_order == X.LSBFirst:
+            self._pixel_layout = "BGRX"
+        else:
+            self._pixel_layout = "XRGB"
+
+    def disconnect(self) -> None:
+        """
+        Release any resources held for the screen connection.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        self._pixel_layout = None
+        if self._display is None:
+            return
+        with self._connections_lock:
+            self._references[self._display_name] -= 1
+            if self._references[self._display_name] == 0:
+                self._connections.pop(self._display_name).close()
+                del self._references[self._display_name]
+                del self._locks[self._display_name]
+        self._display = None
+        self._lock = None
+
+    def grab(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Grab the pixels of a screen region without any accounting.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+
+        :raises: :py:class:`UnsupportedBackendError` if the pixel format of the
+                 X display does not allow direct grabbing
+        """
+        from Xlib import X
+
+        if self._pixel_layout is None:
+            raise UnsupportedBackendError(
+                "Direct screen grabbing requires an X display with 32 bits per pixel"
+            )
+        # read the requested region directly from the X server framebuffer
+        # without any intermediate subprocesses or temporary files
+        root = self._display.screen().root
+        with self._lock:
+            raw = root.get_image(xpos, ypos, width, height, X.ZPixmap, 0xFFFFFFFF)
+        pixels = numpy.frombuffer(raw.data, dtype=numpy.uint8)
+        # scanlines could be padded beyond the region width
+        pixels = pixels.reshape(height, len(raw.data) // height)[:, : width * 4]
+        pixels = pixels.reshape(height, width, 4)
+        if self._pixel_layout == "BGRX":
+            rgb = pixels[:, :, 2::-1]
+        else:
+            rgb = pixels[:, :, 1:]
+        return Image("", numpy_array=numpy.ascontiguousarray(rgb))
+
+
+class MSSCaptureProvider(CaptureProvider):
+    """
+    Screen capture backend implemented through MSS.
+
+    MSS is a python library using the native screen grabbing facilities (including
+    the X shared memory extension where available) of Linux, Windows, and MacOS.
+    """
+
+    def __init__(self, display: str = None) -> None:
+        """
+        Build a capture provider using MSS.
+
+        :param display: name of the X display or None for the current one
+        """
+        super(MSSCaptureProvider, self).__init__()
+        self._display_name = display
+        self._grabber = None
+
+    def connect(self) -> None:
+        """
+        Connect to the screen and obtain its size.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        import mss
+
+        self.disconnect()
+        if self._display_name is not None:
+            self._grabber = mss.mss(display=self._display_name)
+        else:
+            self._grabber = mss.mss()
+        # the first monitor is the union of all monitors
+        monitor = self._grabber.monitors[0]
+        self._width = monitor["width"]
+        self._height = monitor["height"]
+
+    def disconnect(self) -> None:
+        """
+        Release any resources held for the screen connection.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        if self._grabber is not None:
+            self._grabber.close()
+            self._grabber = None
+
+    def grab(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Grab the pixels of a screen region without any accounting.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        monitor = self._grabber.monitors[0]
+        shot = self._grabber.grab(
+            {
+                "left": monitor["left"] + xpos,
+                "top": monitor["top"] + ypos,
+                "width": width,
+                "height": height,
+            }
+        )
+        bgrx = numpy.frombuffer(shot.raw, dtype=numpy.uint8)
+        bgrx = bgrx.reshape(shot.height, shot.width, 4)
+        return Image("", numpy_array=numpy.ascontiguousarray(bgrx[:, :, 2::-1]))
+
+
+class VNCCaptureProvider(CaptureProvider):
+    """
+    Screen capture backend implemented through the VNCDoTool client.
+
+    The provider reads the framebuffer of any screen that is accessible through
+    a VNC/RFB protocol.
+    """
+
+    def __init__(self, server: str = "localhost:0", password: str = None) -> None:
+        """
+        Build a capture provider using VNCDoTool.
+
+        :param server: VNC server address in the form of "hostname:display"
+        :param password: password for the VNC server
+        """
+        super(VNCCaptureProvider, self).__init__()
+        self._server = server
+        self._password = password
+        self._client = None
+
+    def connect(self) -> None:
+        """
+        Connect to the screen and obtain its size.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        from vncdotool import api
+
+        # api.connect() gives us a threaded client, so we need to clean up resources
+        # to avoid dangling connections and deadlocks if connecting more than once
+        self.disconnect()
+        self._client = api.connect(self._server, self._password)
+        self._client.refreshScreen()
+        self._width, self._height = self._client.screen.size
+
+    def disconnect(self) -> None:
+        """
+        Release any resources held for the screen connection.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        if self._client is not None:
+            self._client.disconnect()
+            self._client = None
+
+    def grab(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Grab the pixels of a screen region without any accounting.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        self._client.refreshScreen()
+        cropped = self._client.screen.crop((xpos, ypos, xpos + width, ypos + height))
+        return Image("", cropped.convert("RGB"))
+
+
+def capture_provider(
+    backend: str, display: str = None, password: str = None
+) -> CaptureProvider:
+    """
+    Build a capture provider for a given backend name.
+
+    :param backend: name of the capture backend, one of "x11", "mss", "vnc"
+    :param display: name of the X display or VNC server address to capture
+    :param password: password for the VNC server if needed
+    :returns: an unconnected capture provider
+    :raises: :py:class:`UnsupportedBackendError` if the backend is not supported
+    """
+    if backend == "x11":
+        return X11CaptureProvider(display)
+    elif backend == "mss":
+        return MSSCaptureProvider(display)
+    elif backend == "vnc":
+        if display is None:
+            return VNCCaptureProvider(password=password)
+        return VNCCaptureProvider(display, password)
+    raise UnsupportedBackendError(
+        "Backend '%s' is not among the supported capture providers" % backend
+    )
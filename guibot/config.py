@@ -53,6 +53,9 @@ class GlobalConfig(type):
     _drop_delay = 0.5
     _rescan_speed_on_find = 0.2
     _wait_for_animations = False
+    _search_near_last_match = False
+    _near_match_window_growth = 2.0
+    _location_atlas = ""
     _smooth_mouse_drag = True
     _screen_autoconnect = True
     _preprocess_special_chars = True
@@ -64,6 +67,7 @@ class GlobalConfig(type):
 
     # backends shared between all instances
     _display_control_backend = "autopy"
+    _screen_capture_backend = "default"
     _find_backend = "hybrid"
     _contour_threshold_backend = "adaptive"
     _template_match_backend = "ccoeff_normed"
@@ -149,6 +153,83 @@ class GlobalConfig(type):
     #: whether to wait for animations to complete and match only static (not moving) targets
     wait_for_animations = property(fget=wait_for_animations, fset=wait_for_animations)
 
+    def search_near_last_match(cls, value: bool = None) -> bool | None:
+        """
+        Getter/setter for property attribute.
+
+        :param value: whether to first search for a target around its last match
+        :returns: current value if no argument was passed otherwise None
+        :raises: :py:class:`ValueError` if value is not boolean or None
+
+        This is useful for static targets like toolbars and menus that reappear
+        at the same place where only a small window around the last match of the
+        target has to be captured and searched before searching the entire region.
+        """
+        if value is None:
+            return cls._search_near_last_match
+        elif value is True or value is False:
+            cls._search_near_last_match = value
+            return None
+        else:
+            raise ValueError
+
+    #: whether to first search for a target around its last match
+    search_near_last_match = property(
+        fget=search_near_last_match, fset=search_near_last_match
+    )
+
+    def near_match_window_growth(cls, value: float = None) -> float | None:
+        """
+        Getter/setter for property attribute.
+
+        :param value: factor by which the margin of the search window around the
+                      last match grows after each miss
+        :returns: current value if no argument was passed otherwise None
+        :raises: :py:class:`ValueError` if value is smaller than 1.0
+
+        The first search window extends the last match by a margin of one match
+        size on each side and each further window grows this margin (by at least
+        one pixel) for up to ten windows or until the window covers half of the
+        searched region. A factor of 1.0 searches only in the first window before
+        searching the entire region.
+        """
+        if value is None:
+            return cls._near_match_window_growth
+        elif value >= 1.0:
+            cls._near_match_window_growth = value
+            return None
+        else:
+            raise ValueError
+
+    #: factor by which the margin of the search window around the last match grows
+    near_match_window_growth = property(
+        fget=near_match_window_growth, fset=near_match_window_growth
+    )
+
+    def location_atlas(cls, value: str = None) -> str | None:
+        """
+        Getter/setter for property attribute.
+
+        :param value: name of a file persisting the last match locations of
+                      targets across runs or an empty string to disable it
+        :returns: current value if no argument was passed otherwise None
+        :raises: :py:class:`ValueError` if value is not a string or None
+
+        This is useful for static targets found at the same place in every
+        run where a target is first verified at its location in the atlas
+        before searching the entire region.
+        """
+        if value is None:
+            return cls._location_atlas
+        elif isinstance(value, str):
+            cls._location_atlas = value
+            return None
+        else:
+            raise ValueError
+
+    #: name of a file persisting the last match locations of targets across runs
+    location_atlas = property(fget=location_atlas, fset=location_atlas)
+
     def smooth_mouse_drag(cls, value: bool = None) -> bool | None:
         """
         Getter/setter for property attribute.
@@ -327,6 +408,38 @@ class GlobalConfig(type):
         fget=display_control_backend, fset=display_control_backend
     )
 
+    def screen_capture_backend(cls, value: str = None) -> str | None:
+        """
+        Getter/setter for property attribute.
+
+        :param value: name of the screen capture backend
+        :returns: current value if no argument was passed otherwise None
+        :raises: :py:class:`ValueError` if value is not among the supported backends
+
+        Supported backends:
+           * default - use the screen capture of the display control backend
+           * x11 - Linux X server framebuffer read through python-xlib
+           * mss - Windows, Linux, and OS X compatible native screen grabbing
+                   (using shared memory on X servers where available)
+           * vnc - guest OS independent framebuffer of a remote machine
+                   accessible through vnc
+
+        .. warning:: To use a particular backend you need to satisfy its dependencies,
+            i.e. the backend has to be installed or you will have unsatisfied imports.
+        """
+        if value is None:
+            return cls._screen_capture_backend
+        else:
+            if value not in ["default", "x11", "mss", "vnc"]:
+                raise ValueError("Unsupported backend for screen capture '%s'" % value)
+            cls._screen_capture_backend = value
+            return None
+
+    #: name of the screen capture backend
+    screen_capture_backend = property(
+        fget=screen_capture_backend, fset=screen_capture_backend
+    )
+
     # these methods do not check for valid values since this
     # is already done during region and target initialization
     def find_backend(cls, value: str = None) -> str | None:
@@ -393,7 +506,8 @@ class GlobalConfig(type):
         :returns: current value if no argument was passed otherwise None
 
         Supported backends: autopy, sqdiff, ccorr, ccoeff, sqdiff_normed,
-        ccorr_normed, ccoeff_normed.
+        ccorr_normed, ccoeff_normed, pyramid_sqdiff_normed, pyramid_ccorr_normed,
+        pyramid_ccoeff_normed.
         """
         if value is None:
             return cls._template_match_backend
@@ -29,6 +29,8 @@ import os
 import re
 import time
 import logging
+import threading
+import collections
 import numpy
 import PIL.Image
 from tempfile import NamedTemporaryFile
@@ -38,6 +40,7 @@ from .config import GlobalConfig, LocalConfig
 from .imagelogger import ImageLogger
 from .target import Image
 from .location import Location
+from .capture import CaptureProvider, X11CaptureProvider, capture_provider
 from .errors import *
 
 log = logging.getLogger("guibot.controller")
@@ -80,6 +83,16 @@ class Controller(LocalConfig):
         self._keymap: inputmap.Key = None
         self._modmap: inputmap.KeyModifier = None
         self._mousemap: inputmap.MouseButton = None
+        self._capture_obj: CaptureProvider = None
+        self._capture_latency = 0.0
+        self._frame: Image = None
+        self._frame_time = 0.0
+        self._frames: collections.deque[tuple[float, Image]] = collections.deque()
+        self._frames_cleared = 0.0
+        self._frames_lock = threading.Lock()
+        self._capture_lock = threading.RLock()
+        self._capture_stop = threading.Event()
+        self._capture_thread: threading.Thread = None
 
         # additional preparation
         if configure:
@@ -147,6 +160,16 @@ class Controller(LocalConfig):
 
     mouse_location = property(fget=get_mouse_location)
 
+    def get_capture_latency(self) -> float:
+        """
+        Getter for readonly attribute.
+
+        :returns: duration of the last screen capture in seconds
+        """
+        return self._capture_latency
+
+    capture_latency = property(fget=get_capture_latency)
+
     def __configure_backend(
         self, backend: str = None, category: str = "control", reset: bool = False
     ) -> None:
@@ -171,6 +194,18 @@ class Controller(LocalConfig):
         self.params[category]["after_click_delay"] = 0.1
         self.params[category]["delay_between_keys"] = 0.1
         self.params[category]["delay_before_keys"] = 0.2
+        # screen capture provider or "default" for the backend's own screen capture
+        self.params[category]["capture_backend"] = GlobalConfig.screen_capture_backend
+        # X display name or VNC server address to capture from (None for default)
+        self.params[category]["capture_display"] = None
+        # password for the VNC server to capture from
+        self.params[category]["capture_password"] = None
+        # maximal age in seconds of a screen frame reused for multiple captures
+        # (e.g. 0.05 for bursts of lookups) or zero to always capture anew
+        self.params[category]["frame_cache_age"] = 0.0
+        # target frame rate and ring buffer size of the optional background capture
+        self.params[category]["capture_fps"] = 10.0
+        self.params[category]["capture_buffer_size"] = 3
         log.log(9, "%s %s\n", category, self.params[category])
 
     def configure_backend(
@@ -215,7 +250,46 @@ class Controller(LocalConfig):
         """
         self.__synchronize_backend(backend, category, reset)
 
-    def _region_from_args(self, *args: "Region") -> tuple[int, int, int, int, str]:
+    def _synchronize_capture(self) -> None:
+        """
+        Synchronize the screen capture provider with the control configuration.
+
+        Any previous provider is disconnected and a new one is connected
+        unless the backend's own screen capture is selected.
+        """
+        if self._capture_obj is not None:
+            self._capture_obj.disconnect()
+            self._capture_obj = None
+        backend = self.params["control"]["capture_backend"]
+        if backend == "default":
+            return
+        log.log(9, "Setting screen capture provider to %s", backend)
+        self._capture_obj = capture_provider(
+            backend,
+            self.params["control"]["capture_display"],
+            self.params["control"]["capture_password"],
+        )
+        self._capture_obj.connect()
+        if (
+            isinstance(self._capture_obj, X11CaptureProvider)
+            and not self._capture_obj.direct_grab
+        ):
+            log.warning(
+                "Unsupported pixel format of the X display, falling back"
+                " to the screen capture of the backend itself"
+            )
+            self._capture_obj.disconnect()
+            self._capture_obj = None
+
+    def _temporary_filename(self) -> str:
+        # TODO: Switch to in-memory conversion - patch backends or request get_raw() from authors
+        with NamedTemporaryFile(prefix="guibot", suffix=".png") as f:
+            # NOTE: the file can be open twice on unix but only once on windows so simply
+            # use the generated filename to avoid this difference and remove it manually
+            filename = f.name
+        return filename
+
+    def _clip_region(self, *args: "Region") -> tuple[int, int, int, int]:
         if len(args) == 4:
             xpos = args[0]
             ypos = args[1]
@@ -242,13 +316,7 @@ class Controller(LocalConfig):
             width = self._width - xpos
         if ypos + height > self._height:
             height = self._height - ypos
-
-        # TODO: Switch to in-memory conversion - patch backends or request get_raw() from authors
-        with NamedTemporaryFile(prefix="guibot", suffix=".png") as f:
-            # NOTE: the file can be open twice on unix but only once on windows so simply
-            # use the generated filename to avoid this difference and remove it manually
-            filename = f.name
-        return xpos, ypos, width, height, filename
+        return xpos, ypos, width, height
 
     def capture_screen(self, *args: "list[int] | Region | None") -> Image:
         """
@@ -257,6 +325,145 @@ class Controller(LocalConfig):
         :param args: region's (x, y, width, height) or a region object or
                      nothing to obtain an image of the full screen
         :returns: image of the current screen
+
+        The screen is captured by the configured capture provider if any
+        or by the backend's own screen capture otherwise. If a frame cache
+        age is configured, a full screen frame is captured at most once within
+        this age and any region is cropped from it until an input action. If
+        background capture is running, any region is cropped from the newest
+        frame in its ring buffer instead until the background capture fails.
+        """
+        if self._capture_thread is not None:
+            return self._crop_frame(self._newest_frame(), *self._clip_region(*args))
+
+        max_age = self.params["control"]["frame_cache_age"]
+        if max_age <= 0.0:
+            return self._capture_fresh(*self._clip_region(*args))
+
+        frame_age = time.time() - self._frame_time
+        if self._frame is None or frame_age > max_age:
+            self._frame_time = time.time()
+            self._frame = self._capture_fresh(*self._clip_region())
+        else:
+            log.log(9, "Reusing screen frame captured %.2f ms ago", frame_age * 1000)
+        return self._crop_frame(self._frame, *self._clip_region(*args))
+
+    def _capture_fresh(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        # the backend could be used by a background capture thread at the same time
+        with self._capture_lock:
+            start_time = time.time()
+            if self._capture_obj is not None:
+                image = self._capture_obj.capture(xpos, ypos, width, height)
+            else:
+                image = self._capture_region(xpos, ypos, width, height)
+            self._capture_latency = time.time() - start_time
+        return image
+
+    def _crop_frame(
+        self, frame: Image, xpos: int, ypos: int, width: int, height: int
+    ) -> Image:
+        if (xpos, ypos, width, height) == (0, 0, frame.width, frame.height):
+            return frame
+        cropped = frame.numpy_array[ypos : ypos + height, xpos : xpos + width]
+        return Image("", numpy_array=numpy.ascontiguousarray(cropped))
+
+    def clear_frame_cache(self) -> None:
+        """
+        Drop any cached screen frame so that the next capture is fresh.
+
+        This is done automatically upon any input action but could also be
+        useful for screen changes that are not triggered by this controller.
+        """
+        self._frame = None
+        with self._frames_lock:
+            self._frames_cleared = time.time()
+            self._frames.clear()
+
+    def get_frames(self) -> list[tuple[float, Image]]:
+        """
+        Getter for readonly attribute.
+
+        :returns: timestamped full screen frames from the background
+                  capture ring buffer ordered from oldest to newest
+        """
+        with self._frames_lock:
+            return list(self._frames)
+
+    frames = property(fget=get_frames)
+
+    def start_background_capture(self) -> None:
+        """
+        Start capturing the full screen continuously in a background thread.
+
+        The frames are captured at a target rate of the `capture_fps` control
+        parameter and kept in a ring buffer of `capture_buffer_size` frames. Any
+        screen capture is then obtained from the newest frame in the buffer
+        without waiting for a fresh grab, overlapping capture with matching.
+        """
+        if self._capture_thread is not None:
+            return
+        self._frames = collections.deque(
+            maxlen=self.params["control"]["capture_buffer_size"]
+        )
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="guibot-capture", daemon=True
+        )
+        self._capture_thread.start()
+
+    def stop_background_capture(self) -> None:
+        """Stop any background screen capture and drop its captured frames."""
+        # the capture thread could also stop itself in the meantime
+        capture_thread = self._capture_thread
+        if capture_thread is None:
+            return
+        self._capture_stop.set()
+        capture_thread.join()
+        self._capture_thread = None
+        with self._frames_lock:
+            self._frames.clear()
+
+    def _capture_loop(self) -> None:
+        period = 1.0 / self.params["control"]["capture_fps"]
+        while not self._capture_stop.is_set():
+            start_time = time.time()
+            try:
+                frame = self._capture_fresh(*self._clip_region())
+            except Exception as error:
+                log.error("Background screen capture failed, stopping it: %s", error)
+                # no longer current frames must not be served so fall back
+                # to capturing anew for each screen capture
+                with self._frames_lock:
+                    self._frames.clear()
+                    self._capture_thread = None
+                return
+            with self._frames_lock:
+                # frames started before an input action show an outdated screen
+                if start_time >= self._frames_cleared:
+                    self._frames.append((start_time, frame))
+            self._capture_stop.wait(max(0.0, period - (time.time() - start_time)))
+
+    def _newest_frame(self) -> Image:
+        with self._frames_lock:
+            if len(self._frames) > 0:
+                return self._frames[-1][1]
+        # no frame since the last input action so capture one right away
+        start_time = time.time()
+        frame = self._capture_fresh(*self._clip_region())
+        with self._frames_lock:
+            if start_time >= self._frames_cleared:
+                self._frames.append((start_time, frame))
+        return frame
+
+    def _capture_region(self, xpos: int, ypos: int, width: int, height: int) -> Image:
+        """
+        Get a region of the current screen as image using the backend itself.
+
+        :param xpos: x coordinate of the upleft vertex of the region
+        :param ypos: y coordinate of the upleft vertex of the region
+        :param width: width of the region
+        :param height: height of the region
+        :returns: image of the screen region
         :raises: :py:class:`NotImplementedError` if the base class method is called
         """
         raise NotImplementedError(
@@ -379,7 +586,7 @@ class Controller(LocalConfig):
             self.imglog.clear()
             return
 
-        self.imglog.hotmaps += [numpy.array(self.capture_screen().pil_image)]
+        self.imglog.hotmaps += [self.capture_screen().numpy_array.copy()]
         self.imglog.draw_locations(
             [self.get_mouse_location().coords],
             self.imglog.hotmaps[-1],
@@ -485,6 +692,7 @@ class AutoPyController(Controller):
         self._keymap = inputmap.AutoPyKey()
         self._modmap = inputmap.AutoPyKeyModifier()
         self._mousemap = inputmap.AutoPyMouseButton()
+        self._synchronize_capture()
 
     def synchronize_backend(
         self, backend: str = None, category: str = "autopy", reset: bool = False
@@ -498,16 +706,14 @@ class AutoPyController(Controller):
         """
         self.__synchronize_backend(backend, category, reset)
 
-    def capture_screen(self, *args: "list[int] | Region | None") -> Image:
+    def _capture_region(self, xpos: int, ypos: int, width: int, height: int) -> Image:
         """
-        Get the current screen as image.
+        Get a region of the current screen as image using the backend itself.
 
         Custom implementation of the base method.
 
         See base method for details.
         """
-        xpos, ypos, width, height, filename = self._region_from_args(*args)
-
         # autopy works in points and requires a minimum of one point along a dimension
         xpos, ypos, width, height = (
             xpos / self._scale,
@@ -527,6 +733,7 @@ class AutoPyController(Controller):
             )
         except ValueError:
             return Image("", PIL.Image.new("RGB", (1, 1)))
+        filename = self._temporary_filename()
         autopy_bmp.save(filename)
 
         with PIL.Image.open(filename) as f:
@@ -548,6 +755,7 @@ class AutoPyController(Controller):
         else:
             self._backend_obj.mouse.move(x, y)
         self._pointer = location
+        self.clear_frame_cache()
 
     def mouse_click(
         self, button: int = None, count: int = 1, modifiers: list[str] = None
@@ -572,6 +780,7 @@ class AutoPyController(Controller):
             time.sleep(self.params["control"]["after_click_delay"])
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
 
     def mouse_down(self, button: int) -> None:
         """
@@ -582,6 +791,7 @@ class AutoPyController(Controller):
         See base method for details.
         """
         self._backend_obj.mouse.toggle(button, True)
+        self.clear_frame_cache()
 
     def mouse_up(self, button: int) -> None:
         """
@@ -592,6 +802,7 @@ class AutoPyController(Controller):
         See base method for details.
         """
         self._backend_obj.mouse.toggle(button, False)
+        self.clear_frame_cache()
 
     def keys_toggle(self, keys: list[str] | str, up_down: bool) -> None:
         """
@@ -603,6 +814,7 @@ class AutoPyController(Controller):
         """
         for key in keys:
             self._backend_obj.key.toggle(key, up_down, [])
+        self.clear_frame_cache()
 
     def keys_type(self, text: list[str] | str, modifiers: list[str] = None) -> None:
         """
@@ -627,6 +839,7 @@ class AutoPyController(Controller):
 
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
 
 
 class XDoToolController(Controller):
@@ -635,6 +848,9 @@ class XDoToolController(Controller):
     def __init__(self, configure: bool = True, synchronize: bool = True) -> None:
         """Build a DC backend using XDoTool."""
         super(XDoToolController, self).__init__(configure=False, synchronize=False)
+        self._xconnection: X11CaptureProvider = None
+        self._xdisplay: X11CaptureProvider = None
+        self._xpointer: X11CaptureProvider = None
         if configure:
             self.__configure_backend(reset=True)
         if synchronize:
@@ -668,6 +884,14 @@ class XDoToolController(Controller):
         self.params[category] = {}
         self.params[category]["backend"] = "none"
         self.params[category]["binary"] = "xdotool"
+        # input method among "xdotool" (subprocess) and "xtest" (in-process)
+        self.params[category]["input"] = "xdotool"
+        # screen capture method among "xlib" (in-memory) and "xwd" (subprocess)
+        self.params[category]["capture"] = "xlib"
+        # confirm mouse moves by polling the pointer instead of a fixed delay
+        self.params[category]["pointer_confirm"] = True
+        # maximal time in seconds to wait for a mouse move to take effect
+        self.params[category]["pointer_timeout"] = 0.3
 
     def configure_backend(
         self, backend: str = None, category: str = "xdotool", reset: bool = False
@@ -707,7 +931,226 @@ class XDoToolController(Controller):
                 process += args
                 return subprocess.check_output(process, shell=False).decode()
 
-        self._backend_obj = XDoTool(self)
+            def script(self, *commands: tuple[str, ...]) -> str:
+                # chain all commands (including sleeps) into a single invocation
+                if len(commands) == 0:
+                    return ""
+                process = [self.dc.params[category]["binary"]]
+                for command in commands:
+                    process += command
+                return subprocess.check_output(process, shell=False).decode()
+
+        class XTest(XDoTool):
+            """
+            Drop-in replacement for the xdotool client using the XTest extension.
+
+            All xdotool commands issued by the controller are emulated in-process
+            over a persistent X display connection instead of spawning a new
+            subprocess (and X connection) for each input event. Any commands not
+            covered by the emulation are still delegated to the xdotool client.
+            """
+
+            # xdotool specific key names on top of the standard X keysym names
+            aliases = {
+                "ctrl": "Control_L",
+                "alt": "Alt_L",
+                "shift": "Shift_L",
+                "meta": "Meta_L",
+                "super": "Super_L",
+                "CtrlR": "Control_R",
+                "AltR": "Alt_R",
+                "ShiftR": "Shift_R",
+                "MetaR": "Meta_R",
+                "enter": "Return",
+                "\n": "Return",
+                "\t": "Tab",
+            }
+            # delay between typed characters in seconds (same as xdotool)
+            type_delay = 0.012
+            # xdotool commands emulated over the X display connection
+            emulated = (
+                "getmouselocation",
+                "getdisplaygeometry",
+                "mousemove",
+                "mousedown",
+                "mouseup",
+                "keydown",
+                "keyup",
+                "type",
+            )
+
+            def __init__(self, dc: Controller, connection: X11CaptureProvider) -> None:
+                super(XTest, self).__init__(dc)
+                self.display = connection.display
+                # the connection could be used by a background capture thread
+                self.lock = connection.lock
+                if not self.display.has_extension("XTEST"):
+                    raise UninitializedBackendError(
+                        "The X server does not support the XTest extension"
+                    )
+                self.scratch_keycode: int = None
+
+            def run(self, command: str, *args: list[str]) -> str:
+                if command not in self.emulated:
+                    log.debug(
+                        "Delegating '%s' from the XTest input to xdotool", command
+                    )
+                    return super(XTest, self).run(command, *args)
+                elif command == "type":
+                    # release the connection between the typed characters
+                    for char in "".join(args):
+                        with self.lock:
+                            self.key_toggle(char, True)
+                            self.key_toggle(char, False)
+                            self.display.sync()
+                        time.sleep(self.type_delay)
+                    return ""
+                with self.lock:
+                    return self.emulate(command, *args)
+
+            def emulate(self, command: str, *args: list[str]) -> str:
+                if command == "getmouselocation":
+                    pointer = self.display.screen().root.query_pointer()
+                    return "x:%i y:%i screen:0 window:0" % (
+                        pointer.root_x,
+                        pointer.root_y,
+                    )
+                elif command == "getdisplaygeometry":
+                    screen = self.display.screen()
+                    return "%i %i" % (screen.width_in_pixels, screen.height_in_pixels)
+                elif command == "mousemove":
+                    self.fake_input("MotionNotify", x=int(args[0]), y=int(args[1]))
+                elif command == "mousedown":
+                    self.fake_input("ButtonPress", int(args[0]))
+                elif command == "mouseup":
+                    self.fake_input("ButtonRelease", int(args[0]))
+                elif command == "keydown":
+                    self.key_toggle(args[0], True)
+                elif command == "keyup":
+                    self.key_toggle(args[0], False)
+                self.display.sync()
+                return ""
+
+            def script(self, *commands: tuple[str, ...]) -> str:
+                for command, *args in commands:
+                    if command == "sleep":
+                        time.sleep(float(args[0]))
+                    else:
+                        self.run(command, *args)
+                return ""
+
+            def fake_input(self, event: str, detail: int = 0, **kwargs: int) -> None:
+                from Xlib import X
+                from Xlib.ext import xtest
+
+                xtest.fake_input(self.display, getattr(X, event), detail, **kwargs)
+
+            def keysym(self, key: str) -> int:
+                from Xlib import XK
+
+                key = self.aliases.get(key, key)
+                keysym = XK.string_to_keysym(key)
+                if keysym == 0 and len(key) == 1:
+                    # Latin-1 characters share their code points with their keysyms
+                    # while the rest of the Unicode characters have a fixed offset
+                    codepoint = ord(key)
+                    keysym = codepoint if codepoint <= 0xFF else 0x01000000 + codepoint
+                if keysym == 0:
+                    raise ValueError("Unknown key '%s' for the XTest input" % key)
+                return keysym
+
+            def keycode(self, keysym: int) -> tuple[int, bool]:
+                keycode = self.display.keysym_to_keycode(keysym)
+                if keycode == 0:
+                    # remap an unused keycode to the missing keysym like xdotool does
+                    if self.scratch_keycode is None:
+                        self.scratch_keycode = self.unused_keycode()
+                    keycode = self.scratch_keycode
+                    self.display.change_keyboard_mapping(keycode, [(keysym, keysym)])
+                    self.display.sync()
+                    return keycode, False
+                shifted = (
+                    self.display.keycode_to_keysym(keycode, 0) != keysym
+                    and self.display.keycode_to_keysym(keycode, 1) == keysym
+                )
+                return keycode, shifted
+
+            def key_toggle(self, key: str, up_down: bool) -> None:
+                keycode, shifted = self.keycode(self.keysym(key))
+                shift = self.display.keysym_to_keycode(self.keysym("shift"))
+                if up_down:
+                    if shifted:
+                        self.fake_input("KeyPress", shift)
+                    self.fake_input("KeyPress", keycode)
+                else:
+                    self.fake_input("KeyRelease", keycode)
+                    if shifted:
+                        self.fake_input("KeyRelease", shift)
+
+            def unused_keycode(self) -> int:
+                first = self.display.display.info.min_keycode
+                count = self.display.display.info.max_keycode - first + 1
+                mapping = self.display.get_keyboard_mapping(first, count)
+                for i in reversed(range(count)):
+                    if not any(mapping[i]):
+                        return first + i
+                # no free keycodes so sacrifice the last one
+                return first + count - 1
+
+        # a single X display connection shared by the input, capture, and pointer
+        if self._xconnection is not None:
+            self._xconnection.disconnect()
+            self._xconnection = None
+        if (
+            self.params[category]["input"] == "xtest"
+            or self.params[category]["capture"] == "xlib"
+            or self.params[category]["pointer_confirm"]
+        ):
+            try:
+                self._xconnection = X11CaptureProvider()
+                self._xconnection.connect()
+            except ImportError:
+                self._xconnection = None
+                log.warning(
+                    "The python-xlib module is not available, falling back to"
+                    " xwd screen capture and fixed delays after mouse moves"
+                    " for the XDO controller"
+                )
+            except Exception as error:
+                self._xconnection = None
+                log.warning(
+                    "Could not connect to the X display (%s), falling back to"
+                    " xwd screen capture and fixed delays after mouse moves"
+                    " for the XDO controller",
+                    error,
+                )
+
+        if self.params[category]["input"] == "xtest":
+            if self._xconnection is None:
+                raise UninitializedBackendError(
+                    "The XTest input requires a connection to the X display"
+                )
+            self._backend_obj = XTest(self, self._xconnection)
+        elif self.params[category]["input"] == "xdotool":
+            self._backend_obj = XDoTool(self)
+        else:
+            raise ValueError(
+                "Invalid input method '%s' for the XDO controller"
+                % self.params[category]["input"]
+            )
+
+        self._xdisplay = None
+        if self.params[category]["capture"] == "xlib":
+            if self._xconnection is not None and self._xconnection.direct_grab:
+                self._xdisplay = self._xconnection
+            elif self._xconnection is not None:
+                log.warning(
+                    "Unsupported pixel format of the X display, falling back"
+                    " to xwd screen capture for the XDO controller"
+                )
+        self._xpointer = None
+        if self.params[category]["pointer_confirm"]:
+            self._xpointer = self._xconnection
 
         self._width, self._height = self._backend_obj.run("getdisplaygeometry").split()
         self._width, self._height = int(self._width), int(self._height)
@@ -715,6 +1158,7 @@ class XDoToolController(Controller):
         self._keymap = inputmap.XDoToolKey()
         self._modmap = inputmap.XDoToolKeyModifier()
         self._mousemap = inputmap.XDoToolMouseButton()
+        self._synchronize_capture()
 
     def synchronize_backend(
         self, backend: str = None, category: str = "xdotool", reset: bool = False
@@ -728,17 +1172,20 @@ class XDoToolController(Controller):
         """
         self.__synchronize_backend(backend, category, reset)
 
-    def capture_screen(self, *args: "list[int] | Region | None") -> Image:
+    def _capture_region(self, xpos: int, ypos: int, width: int, height: int) -> Image:
         """
-        Get the current screen as image.
+        Get a region of the current screen as image using the backend itself.
 
         Custom implementation of the base method.
 
         See base method for details.
         """
-        xpos, ypos, width, height, filename = self._region_from_args(*args)
+        if self._xdisplay is not None:
+            return self._xdisplay.grab(xpos, ypos, width, height)
+
         import subprocess
 
+        filename = self._temporary_filename()
         with subprocess.Popen(
             ("xwd", "-silent", "-root"), stdout=subprocess.PIPE
         ) as xwd:
@@ -774,8 +1221,39 @@ class XDoToolController(Controller):
         self._backend_obj.run("mousemove", str(location.x), str(location.y))
         # handle race conditions where the backend coordinates are updated too
         # slowly by giving some time for the new location to take effect there
-        time.sleep(0.3)
+        if self._xpointer is None:
+            time.sleep(self.params["xdotool"]["pointer_timeout"])
+        else:
+            self._confirm_pointer(location)
         self._pointer = location
+        self.clear_frame_cache()
+
+    def _confirm_pointer(self, location: Location) -> None:
+        """
+        Wait until the X server reports the pointer at a desired location.
+
+        :param location: expected location of the pointer
+
+        The wait is limited by the pointer timeout of the backend in case the
+        pointer could not be moved to the exact location (e.g. off-screen).
+        """
+        root = self._xpointer.display.screen().root
+        timeout = time.time() + self.params["xdotool"]["pointer_timeout"]
+        while True:
+            # the connection could be used by a background capture thread
+            with self._xpointer.lock:
+                pointer = root.query_pointer()
+            if pointer.root_x == location.x and pointer.root_y == location.y:
+                return
+            if time.time() > timeout:
+                log.debug(
+                    "Pointer at (%s, %s) instead of %s after mouse move timeout",
+                    pointer.root_x,
+                    pointer.root_y,
+                    location,
+                )
+                return
+            time.sleep(0.005)
 
     def mouse_click(
         self, button: int = None, count: int = 1, modifiers: list[str] = None
@@ -790,17 +1268,18 @@ class XDoToolController(Controller):
         self.imglog.type = "mouse"
         self.imglog.log(30)
         button = self._mousemap.LEFT_BUTTON if button is None else button
-        if modifiers is not None:
-            self.keys_toggle(modifiers, True)
+        modifiers = [] if modifiers is None else modifiers
+        script = [("keydown", str(key)) for key in modifiers]
         for _ in range(count):
             # BUG: the xdotool click is too fast and non-configurable with timeout
-            # self._backend_obj.run("click", str(button))
-            self.mouse_down(button)
-            time.sleep(self.params["control"]["mouse_toggle_delay"])
-            self.mouse_up(button)
-            time.sleep(self.params["control"]["after_click_delay"])
-        if modifiers is not None:
-            self.keys_toggle(modifiers, False)
+            # script += [("click", str(button))]
+            script += [("mousedown", str(button))]
+            script += self._sleep_command(self.params["control"]["mouse_toggle_delay"])
+            script += [("mouseup", str(button))]
+            script += self._sleep_command(self.params["control"]["after_click_delay"])
+        script += [("keyup", str(key)) for key in modifiers]
+        self._backend_obj.script(*script)
+        self.clear_frame_cache()
 
     def mouse_down(self, button: int) -> None:
         """
@@ -811,6 +1290,7 @@ class XDoToolController(Controller):
         See base method for details.
         """
         self._backend_obj.run("mousedown", str(button))
+        self.clear_frame_cache()
 
     def mouse_up(self, button: int) -> None:
         """
@@ -821,6 +1301,7 @@ class XDoToolController(Controller):
         See base method for details.
         """
         self._backend_obj.run("mouseup", str(button))
+        self.clear_frame_cache()
 
     def keys_toggle(self, keys: list[str] | str, up_down: bool) -> None:
         """
@@ -830,11 +1311,25 @@ class XDoToolController(Controller):
 
         See base method for details.
         """
-        for key in keys:
-            if up_down:
-                self._backend_obj.run("keydown", str(key))
-            else:
-                self._backend_obj.run("keyup", str(key))
+        command = "keydown" if up_down else "keyup"
+        self._backend_obj.script(*[(command, str(key)) for key in keys])
+        self.clear_frame_cache()
+
+    def keys_press(self, keys: list[str] | str) -> None:
+        """
+        Press (hold down and release) together all provided keys.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+        """
+        self.imglog.type = "keys"
+        self.imglog.log(30)
+        script = self._sleep_command(self.params["control"]["delay_before_keys"])
+        script += [("keydown", str(key)) for key in keys]
+        script += [("keyup", str(key)) for key in keys]
+        self._backend_obj.script(*script)
+        self.clear_frame_cache()
 
     def keys_type(self, text: list[str] | str, modifiers: list[str] = None) -> None:
         """
@@ -846,15 +1341,29 @@ class XDoToolController(Controller):
         """
         self.imglog.type = "keys"
         self.imglog.log(30)
-        time.sleep(self.params["control"]["delay_before_keys"])
+        script = self._sleep_command(self.params["control"]["delay_before_keys"])
         if modifiers is not None:
-            self.keys_toggle(modifiers, True)
+            script += [("keydown", str(key)) for key in modifiers]
 
-        for part in text:
-            self._backend_obj.run("type", str(part))
+        # the type command consumes all remaining arguments so it comes last
+        parts = [text] if isinstance(text, str) else [str(part) for part in text]
+        parts = [part for part in parts if part]
+        if len(parts) > 0:
+            script += [("type", *parts)]
+        self._backend_obj.script(*script)
 
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
+
+    def _sleep_command(self, delay: float) -> list[tuple[str, ...]]:
+        """
+        Get a chainable sleep command replacing a sleep between input events.
+
+        :param delay: duration of the sleep in seconds
+        :returns: list with the sleep command or empty list if no sleep is needed
+        """
+        return [("sleep", "%s" % delay)] if delay > 0 else []
 
 
 class VNCDoToolController(Controller):
@@ -867,11 +1376,28 @@ class VNCDoToolController(Controller):
     def __init__(self, configure: bool = True, synchronize: bool = True) -> None:
         """Build a DC backend using VNCDoTool."""
         super(VNCDoToolController, self).__init__(configure=False, synchronize=False)
+        self._capture_bytes = 0
+        # framebuffer updates committed by the client and the regions fetched in
+        # full since connecting which are kept up to date by incremental requests
+        self._updates = threading.Condition()
+        self._updated_rects: list[tuple[int, int, int, int]] = []
+        self._fetched_regions: list[tuple[int, int, int, int]] = []
+        self._pending_request = False
         if configure:
             self.__configure_backend(reset=True)
         if synchronize:
             self.__synchronize_backend(reset=False)
 
+    def get_capture_bytes(self) -> int:
+        """
+        Getter for readonly attribute.
+
+        :returns: number of bytes received from the server for the last screen capture
+        """
+        return self._capture_bytes
+
+    capture_bytes = property(fget=get_capture_bytes)
+
     def __configure_backend(
         self, backend: str = None, category: str = "vncdotool", reset: bool = False
     ) -> None:
@@ -890,6 +1416,17 @@ class VNCDoToolController(Controller):
         self.params[category]["vnc_port"] = 0
         # password for the vnc server
         self.params[category]["vnc_password"] = None
+        # preferred encodings among "raw", "copyrect", "rre", "corre", "hextile",
+        # and "zrle" in order of preference or None for the vncdotool defaults
+        self.params[category]["vnc_encodings"] = None
+        # pixel format among "default" (negotiated 32-bit) and "rgb16" (16-bit)
+        self.params[category]["vnc_pixel_format"] = "default"
+        # request only changes in the captured region since the last update
+        self.params[category]["incremental"] = True
+        # maximal time in seconds to wait for changes in the captured region
+        self.params[category]["update_timeout"] = 0.05
+        # maximal time in seconds to wait for a full update of the captured region
+        self.params[category]["refresh_timeout"] = 10.0
 
     def configure_backend(
         self, backend: str = None, category: str = "vncdotool", reset: bool = False
@@ -919,12 +1456,78 @@ class VNCDoToolController(Controller):
                 "Backend '%s' has not been configured yet" % backend
             )
 
-        from vncdotool import api
-
+        from vncdotool import api, client as vncclient
+
+        encoding_codes = {
+            "raw": 0,
+            "copyrect": 1,
+            "rre": 2,
+            "corre": 4,
+            "hextile": 5,
+            "zrle": 16,
+        }
+        encodings = self.params[category]["vnc_encodings"]
+        if encodings is not None:
+            for encoding in encodings:
+                if encoding not in encoding_codes:
+                    raise ValueError("Unsupported VNC encoding '%s'" % encoding)
+            encodings = [encoding_codes[encoding] for encoding in encodings]
+        pixel_format = self.params[category]["vnc_pixel_format"]
+        if pixel_format not in ["default", "rgb16"]:
+            raise ValueError("Unsupported VNC pixel format '%s'" % pixel_format)
+
+        class VNCDoToolClient(vncclient.VNCDoToolClient):
+            """Client negotiating the configured encodings and pixel format."""
+
+            bytes_received = 0
+
+            def dataReceived(self, data: bytes) -> None:
+                self.bytes_received += len(data)
+                super(VNCDoToolClient, self).dataReceived(data)
+
+            def commitUpdate(
+                self, rectangles: list[tuple[int, int, int, int]] = None
+            ) -> None:
+                dc._commit_update(rectangles or [])
+                super(VNCDoToolClient, self).commitUpdate(rectangles)
+
+            def setImageMode(self) -> None:
+                if pixel_format == "rgb16":
+                    self.setPixelFormat(
+                        bpp=16,
+                        depth=16,
+                        bigendian=0,
+                        truecolor=1,
+                        redmax=31,
+                        greenmax=63,
+                        bluemax=31,
+                        redshift=11,
+                        greenshift=5,
+                        blueshift=0,
+                    )
+                    self.image_mode = "BGR;16"
+                else:
+                    super(VNCDoToolClient, self).setImageMode()
+
+            def setEncodings(self, list_of_encodings: list[int]) -> None:
+                if encodings is not None:
+                    # keep the pseudo-encodings (all negative) of the defaults
+                    pseudo = [code for code in list_of_encodings if code < 0]
+                    list_of_encodings = encodings + pseudo
+                super(VNCDoToolClient, self).setEncodings(list_of_encodings)
+
+        class VNCDoToolFactory(vncclient.VNCDoToolFactory):
+            protocol = VNCDoToolClient
+
+        dc = self
         if self._backend_obj:
             # api.connect() gives us a threaded client, so we need to clean up resources
             # to avoid dangling connections and deadlocks if synchronizing more than once
             self._backend_obj.disconnect()
+        with self._updates:
+            self._updated_rects = []
+            self._fetched_regions = []
+            self._pending_request = False
         self._backend_obj = api.connect(
             "%s:%i"
             % (
@@ -932,6 +1535,7 @@ class VNCDoToolController(Controller):
                 self.params[category]["vnc_port"],
             ),
             self.params[category]["vnc_password"],
+            factory_class=VNCDoToolFactory,
         )
         # for special characters preprocessing for the vncdotool
         self._backend_obj.factory.force_caps = True
@@ -942,8 +1546,7 @@ class VNCDoToolController(Controller):
         logging.getLogger("twisted").setLevel(logging.ERROR)
 
         # screen size
-        with NamedTemporaryFile(prefix="guibot", suffix=".png") as f:
-            filename = f.name
+        filename = self._temporary_filename()
         screen = self._backend_obj.captureScreen(filename)
         os.unlink(filename)
         self._width = screen.width
@@ -957,6 +1560,7 @@ class VNCDoToolController(Controller):
         self._keymap = inputmap.VNCDoToolKey()
         self._modmap = inputmap.VNCDoToolKeyModifier()
         self._mousemap = inputmap.VNCDoToolMouseButton()
+        self._synchronize_capture()
 
     def synchronize_backend(
         self, backend: str = None, category: str = "vncdotool", reset: bool = False
@@ -970,22 +1574,126 @@ class VNCDoToolController(Controller):
         """
         self.__synchronize_backend(backend, category, reset)
 
-    def capture_screen(self, *args: "list[int] | Region | None") -> Image:
+    def _capture_region(self, xpos: int, ypos: int, width: int, height: int) -> Image:
         """
-        Get the current screen as image.
+        Get a region of the current screen as image using the backend itself.
 
         Custom implementation of the base method.
 
         See base method for details.
         """
-        xpos, ypos, width, height, _ = self._region_from_args(*args)
-        self._backend_obj.refreshScreen()
+        bytes_before = self._backend_obj.protocol.bytes_received
+        self._refresh_region(xpos, ypos, width, height)
+        self._capture_bytes = self._backend_obj.protocol.bytes_received - bytes_before
+        log.log(9, "Received %s bytes for screen capture", self._capture_bytes)
         cropped = self._backend_obj.screen.crop(
             (xpos, ypos, xpos + width, ypos + height)
         )
         pil_image = cropped.convert("RGB")
         return Image("", pil_image)
 
+    def _refresh_region(self, xpos: int, ypos: int, width: int, height: int) -> None:
+        """
+        Update the local framebuffer only within a region of the remote screen.
+
+        :param xpos: x coordinate of the upleft vertex of the region
+        :param ypos: y coordinate of the upleft vertex of the region
+        :param width: width of the region
+        :param height: height of the region
+        :raises: :py:class:`TimeoutError` if the region is not updated in time
+
+        The local framebuffer of the client is patched with the received region
+        which is first requested in full. Afterwards, an incremental request for
+        all regions fetched so far is kept pending on the server which only
+        responds to it once there are any changes there. A region fetched before
+        is thus up to date if no such response arrives within the update timeout
+        and no new request is sent while the previous one is still pending. The
+        wait for a full update is limited by the refresh timeout.
+        """
+        from twisted.internet import reactor
+
+        region = (xpos, ypos, width, height)
+        protocol = self._backend_obj.protocol
+
+        def request_update(incremental: bool, x: int, y: int, w: int, h: int) -> None:
+            reactor.callFromThread(
+                protocol.framebufferUpdateRequest, x, y, w, h, incremental=incremental
+            )
+
+        with self._updates:
+            self._updated_rects = []
+            fetched = any(
+                self._region_contains(fetched_region, region)
+                for fetched_region in self._fetched_regions
+            )
+            if self.params["vncdotool"]["incremental"] and fetched:
+                if not self._pending_request:
+                    x0 = min(r[0] for r in self._fetched_regions)
+                    y0 = min(r[1] for r in self._fetched_regions)
+                    x1 = max(r[0] + r[2] for r in self._fetched_regions)
+                    y1 = max(r[1] + r[3] for r in self._fetched_regions)
+                    request_update(True, x0, y0, x1 - x0, y1 - y0)
+                    self._pending_request = True
+                if not self._updates.wait_for(
+                    lambda: not self._pending_request,
+                    self.params["vncdotool"]["update_timeout"],
+                ):
+                    log.log(9, "No changes within %sx%s region", width, height)
+                return
+
+            request_update(False, *region)
+            if not self._updates.wait_for(
+                lambda: self._rects_cover(self._updated_rects, region),
+                self.params["vncdotool"]["refresh_timeout"],
+            ):
+                raise TimeoutError(
+                    "No update of the %sx%s region from the VNC server within %ss"
+                    % (width, height, self.params["vncdotool"]["refresh_timeout"])
+                )
+            self._fetched_regions = [
+                fetched_region
+                for fetched_region in self._fetched_regions
+                if not self._region_contains(region, fetched_region)
+            ]
+            self._fetched_regions.append(region)
+
+    def _commit_update(self, rectangles: list[tuple[int, int, int, int]]) -> None:
+        """
+        Register a framebuffer update committed by the client.
+
+        :param rectangles: updated rectangles (x, y, width, height)
+
+        Any update also answers a pending incremental request since the server
+        sends all changes of all requested regions together.
+        """
+        with self._updates:
+            self._updated_rects.extend(rectangles)
+            self._pending_request = False
+            self._updates.notify_all()
+
+    @staticmethod
+    def _region_contains(
+        outer: tuple[int, int, int, int], inner: tuple[int, int, int, int]
+    ) -> bool:
+        return (
+            outer[0] <= inner[0]
+            and outer[1] <= inner[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2]
+            and inner[1] + inner[3] <= outer[1] + outer[3]
+        )
+
+    @staticmethod
+    def _rects_cover(
+        rects: list[tuple[int, int, int, int]], region: tuple[int, int, int, int]
+    ) -> bool:
+        xpos, ypos, width, height = region
+        covered = numpy.zeros((height, width), dtype=bool)
+        for x, y, w, h in rects:
+            x0, y0 = max(x - xpos, 0), max(y - ypos, 0)
+            x1, y1 = max(x + w - xpos, 0), max(y + h - ypos, 0)
+            covered[y0:y1, x0:x1] = True
+        return bool(covered.all())
+
     def mouse_move(self, location: Location, smooth: bool = True) -> None:
         """
         Move the mouse to a desired location.
@@ -999,6 +1707,7 @@ class VNCDoToolController(Controller):
         else:
             self._backend_obj.mouseMove(location.x, location.y)
         self._pointer = location
+        self.clear_frame_cache()
 
     def mouse_click(
         self, button: int = None, count: int = 1, modifiers: list[str] = None
@@ -1025,6 +1734,7 @@ class VNCDoToolController(Controller):
             time.sleep(self.params["control"]["after_click_delay"])
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
 
     def mouse_down(self, button: int) -> None:
         """
@@ -1035,6 +1745,7 @@ class VNCDoToolController(Controller):
         See base method for details.
         """
         self._backend_obj.mouseDown(button)
+        self.clear_frame_cache()
 
     def mouse_up(self, button: int) -> None:
         """
@@ -1045,6 +1756,7 @@ class VNCDoToolController(Controller):
         See base method for details.
         """
         self._backend_obj.mouseUp(button)
+        self.clear_frame_cache()
 
     def keys_toggle(self, keys: list[str] | str, up_down: bool) -> None:
         """
@@ -1065,6 +1777,7 @@ class VNCDoToolController(Controller):
                 self._backend_obj.keyDown(key)
             else:
                 self._backend_obj.keyUp(key)
+        self.clear_frame_cache()
 
     def keys_type(self, text: list[str] | str, modifiers: list[str] = None) -> None:
         """
@@ -1095,6 +1808,7 @@ class VNCDoToolController(Controller):
 
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
 
 
 class PyAutoGUIController(Controller):
@@ -1177,6 +1891,7 @@ class PyAutoGUIController(Controller):
         self._keymap = inputmap.PyAutoGUIKey()
         self._modmap = inputmap.PyAutoGUIKeyModifier()
         self._mousemap = inputmap.PyAutoGUIMouseButton()
+        self._synchronize_capture()
 
     def synchronize_backend(
         self, backend: str = None, category: str = "pyautogui", reset: bool = False
@@ -1190,16 +1905,14 @@ class PyAutoGUIController(Controller):
         """
         self.__synchronize_backend(backend, category, reset)
 
-    def capture_screen(self, *args: "list[int] | Region | None") -> Image:
+    def _capture_region(self, xpos: int, ypos: int, width: int, height: int) -> Image:
         """
-        Get the current screen as image.
+        Get a region of the current screen as image using the backend itself.
 
         Custom implementation of the base method.
 
         See base method for details.
         """
-        xpos, ypos, width, height, _ = self._region_from_args(*args)
-
         pil_image = self._backend_obj.screenshot(region=(xpos, ypos, width, height))
         return Image("", pil_image)
 
@@ -1216,6 +1929,7 @@ class PyAutoGUIController(Controller):
         else:
             self._backend_obj.moveTo(location.x, location.y)
         self._pointer = location
+        self.clear_frame_cache()
 
     def mouse_click(
         self, button: int = None, count: int = 1, modifiers: list[str] = None
@@ -1242,6 +1956,7 @@ class PyAutoGUIController(Controller):
             time.sleep(self.params["control"]["after_click_delay"])
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
 
     def mouse_down(self, button: int) -> None:
         """
@@ -1252,6 +1967,7 @@ class PyAutoGUIController(Controller):
         See base method for details.
         """
         self._backend_obj.mouseDown(button=button)
+        self.clear_frame_cache()
 
     def mouse_up(self, button: int) -> None:
         """
@@ -1262,6 +1978,7 @@ class PyAutoGUIController(Controller):
         See base method for details.
         """
         self._backend_obj.mouseUp(button=button)
+        self.clear_frame_cache()
 
     def mouse_scroll(self, clicks: int = 10, horizontal: bool = False) -> None:
         """
@@ -1275,6 +1992,7 @@ class PyAutoGUIController(Controller):
             self._backend_obj.hscroll(clicks)
         else:
             self._backend_obj.scroll(clicks)
+        self.clear_frame_cache()
 
     def keys_toggle(self, keys: list[str] | str, up_down: bool) -> None:
         """
@@ -1289,6 +2007,7 @@ class PyAutoGUIController(Controller):
                 self._backend_obj.keyDown(key)
             else:
                 self._backend_obj.keyUp(key)
+        self.clear_frame_cache()
 
     def keys_type(self, text: list[str] | str, modifiers: list[str] = None) -> None:
         """
@@ -1311,3 +2030,4 @@ class PyAutoGUIController(Controller):
 
         if modifiers is not None:
             self.keys_toggle(modifiers, False)
+        self.clear_frame_cache()
@@ -29,7 +29,11 @@ import os
 import sys
 import re
 import copy
+import atexit
+import json
+import time
 import random
+import threading
 import configparser as config
 import PIL.Image
 from typing import Callable
@@ -239,6 +243,8 @@ class Finder(LocalConfig):
     all be manually adjusted or automatically calibrated.
     """
 
+    _match_cache = {}
+
     @staticmethod
     def from_match_file(filename: str) -> "Finder":
         """
@@ -252,24 +258,14 @@ class Finder(LocalConfig):
         all parameters will be generated (if not already present) and then the
         ones read from the configuration file will be overwritten.
         """
-        parser = config.RawConfigParser()
-        # preserve case sensitivity
-        parser.optionxform = str
-
         if not filename.endswith(".match"):
             filename += ".match"
         if not os.path.exists(filename):
             filename = FileResolver().search(filename)
-        success = parser.read(filename)
-        # if no file is found throw an exception
-        if len(success) == 0:
-            raise IOError("Match file %s is corrupted and cannot be read" % filename)
-        if not parser.has_section("find"):
+        sections = Finder._parse_match_file(filename)
+        if "find" not in sections:
             raise IOError("No image matching configuration can be found")
-        try:
-            backend_name = parser.get("find", "backend")
-        except config.NoOptionError:
-            backend_name = GlobalConfig.find_backend
+        backend_name = sections["find"].get("backend", GlobalConfig.find_backend)
 
         if backend_name == "autopy":
             finder = AutoPyFinder(synchronize=False)
@@ -293,16 +289,15 @@ class Finder(LocalConfig):
             raise UnsupportedBackendError("No '%s' backend is supported" % backend_name)
 
         for category in finder.params.keys():
-            if parser.has_section(category):
-                section_backend = parser.get(category, "backend")
+            if category in sections:
+                section_backend = sections[category]["backend"]
                 if section_backend != finder.params[category]["backend"]:
                     finder.configure_backend(
                         backend=section_backend, category=category, reset=False
                     )
-                for option in parser.options(category):
+                for option, param_string in sections[category].items():
                     if option == "backend":
                         continue
-                    param_string = parser.get(category, option)
                     if isinstance(finder.params[category][option], CVParameter):
                         param = CVParameter.from_string(param_string)
                         log.log(9, "%s %s", param_string, param)
@@ -313,6 +308,35 @@ class Finder(LocalConfig):
         finder.synchronize()
         return finder
 
+    @staticmethod
+    def _parse_match_file(filename: str) -> dict[str, dict[str, str]]:
+        """
+        Parse the sections of a match file reusing any previous unchanged parsing.
+
+        :param filename: existing match filename
+        :returns: options (as strings) for each section of the match file
+        :raises: :py:class:`IOError` if the respective match file couldn't be read
+        """
+        # parsed files are shared among all finders (and sessions) but are
+        # parsed again in case the file was modified in the meantime
+        mtime = os.path.getmtime(filename)
+        cached = Finder._match_cache.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        parser = config.RawConfigParser()
+        # preserve case sensitivity
+        parser.optionxform = str
+        success = parser.read(filename)
+        # if no file is found throw an exception
+        if len(success) == 0:
+            raise IOError("Match file %s is corrupted and cannot be read" % filename)
+        sections = {}
+        for section in parser.sections():
+            sections[section] = dict(parser.items(section))
+        Finder._match_cache[filename] = (mtime, sections)
+        return sections
+
     @staticmethod
     def to_match_file(finder: "Finder", filename: str) -> None:
         """
@@ -358,6 +382,10 @@ class Finder(LocalConfig):
             "hybrid",
         ]
 
+        # persistent copies of this finder for concurrent matching with their
+        # configuration at the time of copying for each use of the copies
+        self._pools: dict[str, tuple[tuple[Any, ...], list["Finder"]]] = {}
+
         # additional preparation (no synchronization available)
         if configure:
             self.__configure_backend(reset=True)
@@ -499,6 +527,216 @@ class Finder(LocalConfig):
             "Abstract method call - call implementation of this class"
         )
 
+    def find_many(
+        self, needles: "list[Target]", haystack: "Image", workers: int = 1
+    ) -> "list[list[Match]]":
+        """
+        Find all matches of multiple needle targets in the same haystack image.
+
+        :param needles: targets to look for
+        :param haystack: image to look in
+        :param workers: number of needles matched concurrently
+        :returns: all found matches for each of the needles in the same order
+
+        The haystack data is converted (e.g. to grayscale) only once for all
+        needles since conversions are cached by the image. Concurrent matching
+        uses a persistent copy of the current finder for each additional worker
+        since image logging and some caches are specific to a finder.
+        """
+        log.debug("Looking for %i needles in the same haystack", len(needles))
+        workers = min(workers, len(needles))
+        if workers <= 1:
+            return [self.find(needle, haystack) for needle in needles]
+
+        copies = self._finder_pool("many", workers - 1)
+        matches = self._map_finders(
+            [self] + copies,
+            lambda finder, needle: finder.find(needle, haystack),
+            needles,
+        )
+        self._merge_finders(copies)
+        # the needles should not keep any of the copies as their own settings
+        for needle in needles:
+            needle.match_settings = self
+        return matches
+
+    def _finder_pool(self, name: str, count: int) -> "list[Finder]":
+        """
+        Obtain persistent copies of the current finder for concurrent matching.
+
+        :param name: name of the pool of copies for one particular use
+        :param count: number of copies to obtain
+        :returns: copies of the current finder kept with their own caches among
+                  calls as long as the configuration of the current finder stays
+                  the same (each copy always obtained at the same position)
+        """
+        signature = tuple(
+            (category, key, param.value if isinstance(param, CVParameter) else param)
+            for category in sorted(self.params.keys())
+            for key, param in sorted(self.params[category].items())
+        )
+        pool_signature, pool = self._pools.get(name, (None, []))
+        if pool_signature != signature:
+            log.debug("Building new finder copies for concurrent %s matching", name)
+            pool = []
+        while len(pool) < count:
+            pool.append(self.copy())
+        self._pools[name] = (signature, pool)
+        return pool[:count]
+
+    def _merge_finders(self, finders: "list[Finder]") -> None:
+        """
+        Merge any state learned by copies of the current finder back into it.
+
+        :param finders: copies of the current finder used for concurrent matching
+        """
+        pass
+
+    def _map_finders(
+        self,
+        finders: "list[Finder]",
+        func: Callable[["Finder", Any], Any],
+        items: list[Any],
+    ) -> list[Any]:
+        """
+        Apply a function to all items concurrently using one finder per thread.
+
+        :param finders: finders to use with each of them used by one thread at a time
+        :param func: function called with an idle finder and an item
+        :param items: items to apply the function to
+        :returns: results of the function for each of the items in the same order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        idle_finders = list(finders)
+        lock = threading.Lock()
+
+        def apply(item: Any) -> Any:
+            with lock:
+                finder = idle_finders.pop()
+            try:
+                return func(finder, item)
+            finally:
+                with lock:
+                    idle_finders.append(finder)
+
+        with ThreadPoolExecutor(max_workers=len(finders)) as executor:
+            return list(executor.map(apply, items))
+
+    def _find_tiles(
+        self,
+        needle: "Target",
+        haystack: "Image",
+        category: str,
+        find: Callable[["Finder", "Target", "Image"], "list[Match]"],
+        overlap: tuple[int, int],
+    ) -> "list[Match]":
+        """
+        Find all needle targets in overlapping tiles of a haystack image.
+
+        :param needle: target to look for
+        :param haystack: image to look in
+        :param category: category of the parameter with the number of tiles
+                         along each of the haystack dimensions
+        :param find: unbound find method to match the needle in each tile
+        :param overlap: width and height of the largest possible match so that
+                        each match is fully contained in at least one tile
+        :returns: all found matches in haystack coordinates with duplicates
+                  from overlapping tiles removed
+
+        All tiles are matched concurrently, each by its own persistent copy of
+        the current finder that also performs its own image logging and keeps
+        its own caches for the same tile among calls. If the overlap is so large
+        that a tile would span the entire haystack, the haystack is matched as
+        a single tile instead.
+        """
+        import numpy
+        from concurrent.futures import ThreadPoolExecutor
+        from .target import Image
+        from .match import Match
+
+        tiles = self.params[category]["tiles"].value
+        tile_width = -(-haystack.width // tiles)
+        tile_height = -(-haystack.height // tiles)
+        overlap_width = max(min(overlap[0], haystack.width) - 1, 0)
+        overlap_height = max(min(overlap[1], haystack.height) - 1, 0)
+        boxes = []
+        if (
+            tile_width + overlap_width < haystack.width
+            or tile_height + overlap_height < haystack.height
+        ):
+            for y in range(0, haystack.height, tile_height):
+                for x in range(0, haystack.width, tile_width):
+                    boxes.append(
+                        (
+                            x,
+                            y,
+                            min(x + tile_width + overlap_width, haystack.width),
+                            min(y + tile_height + overlap_height, haystack.height),
+                        )
+                    )
+        else:
+            log.debug("Overlap %s too large for tiles of the haystack", overlap)
+            boxes.append((0, 0, haystack.width, haystack.height))
+        log.debug("Matching %i haystack tiles with overlap %s", len(boxes), overlap)
+
+        finders = self._finder_pool("tiles", len(boxes))
+        for finder in finders:
+            # each tile is matched as a whole
+            finder.params[category]["tiles"].value = 1
+
+        def find_tile(
+            finder: "Finder", box: tuple[int, int, int, int]
+        ) -> "list[Match]":
+            x0, y0, x1, y1 = box
+            tile_array = numpy.ascontiguousarray(haystack.numpy_array[y0:y1, x0:x1])
+            return [
+                Match(
+                    match.x + x0,
+                    match.y + y0,
+                    match.width,
+                    match.height,
+                    match.dx,
+                    match.dy,
+                    match.similarity,
+                )
+                for match in find(finder, needle, Image(numpy_array=tile_array))
+            ]
+
+        workers = min(len(boxes), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tile_matches = list(executor.map(find_tile, finders, boxes))
+        self._merge_finders(finders)
+        needle.match_settings = self
+
+        # the same match can be found in multiple overlapping tiles
+        matches = []
+        candidates = [match for tile in tile_matches for match in tile]
+        candidates.sort(key=lambda match: match.similarity, reverse=True)
+        for candidate in candidates:
+            for match in matches:
+                # compare the boxes so that differently sized matches are kept
+                overlap_width = min(
+                    candidate.x + candidate.width, match.x + match.width
+                ) - max(candidate.x, match.x)
+                overlap_height = min(
+                    candidate.y + candidate.height, match.y + match.height
+                ) - max(candidate.y, match.y)
+                if overlap_width <= 0 or overlap_height <= 0:
+                    continue
+                intersection = overlap_width * overlap_height
+                union = (
+                    candidate.width * candidate.height
+                    + match.width * match.height
+                    - intersection
+                )
+                if intersection > 0.5 * union:
+                    break
+            else:
+                matches.append(candidate)
+        log.debug("A total of %i matches found in all tiles", len(matches))
+        return matches
+
     def log(self, lvl: int) -> None:
         """
         Log images with an arbitrary logging level.
@@ -805,17 +1043,14 @@ class ContourFinder(Finder):
         import cv2
         import numpy
 
-        orig_needle = numpy.array(needle.pil_image)
-        thresh_needle = self._binarize_image(orig_needle, log=False)
-        countours_needle = thresh_needle.copy()
-        needle_contours = self._extract_contours(countours_needle, log=False)
+        needle_contours = self._needle_contours(needle)
 
-        orig_haystack = numpy.array(haystack.pil_image)
+        orig_haystack = haystack.numpy_array
         thresh_haystack = self._binarize_image(orig_haystack, log=True)
         countours_haystack = thresh_haystack.copy()
         haystack_contours = self._extract_contours(countours_haystack, log=True)
 
-        self.imglog.hotmaps.append(numpy.array(haystack.pil_image))
+        self.imglog.hotmaps.append(haystack.numpy_array.copy())
 
         distances = numpy.ones((len(haystack_contours), len(needle_contours)))
         for i, hcontour in enumerate(haystack_contours):
@@ -911,6 +1146,31 @@ class ContourFinder(Finder):
         self.imglog.log(30)
         return matches
 
+    def _needle_contours(self, needle: "Image") -> "list[Matlike]":
+        """
+        EXTRA DOCSTRING: Contour matching - needle preprocessing.
+
+        Binarize the needle and extract its contours only once for each
+        threshold and contour configuration reusing them for all searches.
+        """
+
+        def _contour_config(category: str) -> tuple[Any, ...]:
+            return tuple(
+                (key, param.value if isinstance(param, CVParameter) else param)
+                for key, param in sorted(self.params[category].items())
+            )
+
+        thresh_needle = needle.derive(
+            "binarized",
+            _contour_config("threshold"),
+            lambda: self._binarize_image(needle.numpy_array, log=False),
+        )
+        return needle.derive(
+            "contours",
+            _contour_config("threshold") + _contour_config("contour"),
+            lambda: self._extract_contours(thresh_needle.copy(), log=False),
+        )
+
     def _binarize_image(self, image: "Matlike", log: bool = False) -> "Matlike":
         import cv2
 
@@ -1029,12 +1289,24 @@ class TemplateFinder(Finder):
         # available and currently fully compatible methods
         self.categories["template"] = "template_matchers"
         # we only use the normalized version of "sqdiff", "ccorr", and "ccoeff"
+        # also matched coarse-to-fine on an image pyramid for large haystacks
         self.algorithms["template_matchers"] = (
             "sqdiff_normed",
             "ccorr_normed",
             "ccoeff_normed",
+            "pyramid_sqdiff_normed",
+            "pyramid_ccorr_normed",
+            "pyramid_ccoeff_normed",
         )
 
+        # other attributes
+        self._result_cache: dict[tuple[int, ...], tuple["Matlike", "Matlike"]] = {}
+        # bounds of the incremental matching cache which is kept per finder (and
+        # thus per persistent copy of it) with about 14 MB per entry for 1080p
+        self._result_cache_size = 4
+        self._result_cache_bytes = 32 * 1024 * 1024
+        self._last_scale: float = None
+
         # additional preparation (no synchronization available)
         if configure:
             self.__configure_backend(reset=True)
@@ -1060,6 +1332,21 @@ class TemplateFinder(Finder):
         self.params[category] = {}
         self.params[category]["backend"] = backend
         self.params[category]["nocolor"] = CVParameter(False)
+        # only rematch the parts of the haystack changed since the last matching
+        # (approximate scores that could reorder matches of almost equal scores)
+        self.params[category]["incremental"] = CVParameter(False)
+        # peak extraction among "iterative" and "vectorized" (same matches)
+        self.params[category]["peaks"] = CVParameter("iterative")
+        # number of halvings of the haystack for the coarse pyramid matching
+        self.params[category]["pyramid_levels"] = CVParameter(2, 1, 5, 1.0)
+        # similarity margin below the required one for coarse pyramid candidates
+        self.params[category]["pyramid_margin"] = CVParameter(0.2, 0.0, 1.0, 0.1, 0.01)
+        # range and step of needle scales to search for (e.g. for display scaling)
+        self.params[category]["scale_min"] = CVParameter(1.0, 0.1, 10.0, 0.25, 0.05)
+        self.params[category]["scale_max"] = CVParameter(1.0, 0.1, 10.0, 0.25, 0.05)
+        self.params[category]["scale_step"] = CVParameter(0.25, 0.01, 1.0, 0.1, 0.01)
+        # number of tiles along each haystack dimension matched concurrently
+        self.params[category]["tiles"] = CVParameter(1, 1, None)
         log.log(9, "%s %s\n", category, self.params[category])
 
     def configure_backend(
@@ -1074,6 +1361,24 @@ class TemplateFinder(Finder):
         """
         self.__configure_backend(backend, category, reset)
 
+    def _merge_finders(self, finders: "list[Finder]") -> None:
+        """
+        Merge any state learned by copies of the current finder back into it.
+
+        Custom implementation of the base method.
+
+        See base method for details.
+
+        The needle scale last matched by any copy is shared with the current
+        finder and all copies so that all of them try it first next time.
+        """
+        for finder in finders:
+            if finder._last_scale != self._last_scale:
+                self._last_scale = finder._last_scale
+                break
+        for finder in finders:
+            finder._last_scale = self._last_scale
+
     def find(self, needle: "Image", haystack: "Image") -> "list[Match]":
         """
         Find all needle targets in a haystack image.
@@ -1087,6 +1392,13 @@ class TemplateFinder(Finder):
 
         See base method for details.
         """
+        if self.params["template"]["tiles"].value > 1:
+            scale = self.params["template"]["scale_max"].value
+            overlap = (int(needle.width * scale) + 1, int(needle.height * scale) + 1)
+            return self._find_tiles(
+                needle, haystack, "template", TemplateFinder.find, overlap
+            )
+
         needle.match_settings = self
         needle.use_own_settings = True
         self.imglog.needle = needle
@@ -1112,58 +1424,79 @@ class TemplateFinder(Finder):
             match_template,
             "without" if no_color else "with",
         )
-        result = self._match_template(needle, haystack, no_color, match_template)
-        if result is None:
-            log.warning("OpenCV's template matching returned no result")
-            return []
-        # switch max and min for sqdiff and sqdiff_normed (to always look for max)
-        if self.params["template"]["backend"] in ("sqdiff_normed"):
-            result = 1.0 - result
 
         import cv2
         import numpy
 
-        universal_hotmap = result * 255.0
-        final_hotmap = numpy.array(self.imglog.haystack.pil_image)
-        if self.params["template"]["nocolor"].value:
-            final_hotmap = cv2.cvtColor(final_hotmap, cv2.COLOR_RGB2GRAY)
-
-        # extract maxima once for each needle size region
+        # hotmaps are only built if they would be dumped by the image logging
+        log_hotmaps = 30 >= self.imglog.logging_level
         similarity = self.params["find"]["similarity"].value
+        # the first scale with acceptable matches wins, otherwise the best one is logged
+        best = None
+        for scale in self._needle_scales():
+            scaled_needle = self._scaled_needle(needle, scale)
+            result = self._match_template(
+                scaled_needle, haystack, no_color, match_template
+            )
+            if result is None:
+                continue
+            # switch max and min for sqdiff and sqdiff_normed (to always look for max)
+            if self.params["template"]["backend"] in (
+                "sqdiff_normed",
+                "pyramid_sqdiff_normed",
+            ):
+                result = 1.0 - result
+            universal_hotmap = result * 255.0 if log_hotmaps else None
+
+            # extract maxima once for each needle size region
+            if self.params["template"]["peaks"].value == "vectorized":
+                peaks = self._vectorized_peaks(result, similarity, scaled_needle)
+            else:
+                peaks = self._iterative_peaks(result, similarity, scaled_needle)
+            if len(peaks) > 0:
+                log.log(9, "Needle matched at scale %s", scale)
+                best = (scale, scaled_needle, result, universal_hotmap, peaks)
+                self._last_scale = scale
+                break
+            if best is None or result.max() > best[2].max():
+                best = (scale, scaled_needle, result, universal_hotmap, peaks)
+        if best is None:
+            log.warning("OpenCV's template matching returned no result")
+            return []
+        scale, scaled_needle, result, universal_hotmap, peaks = best
+
+        if log_hotmaps:
+            final_hotmap = self.imglog.haystack.numpy_array.copy()
+            if self.params["template"]["nocolor"].value:
+                final_hotmap = cv2.cvtColor(final_hotmap, cv2.COLOR_RGB2GRAY)
         from .match import Match
 
         matches = []
-        while True:
-
+        if len(peaks) == 0:
             minVal, maxVal, minLoc, maxLoc = cv2.minMaxLoc(result)
             # rectify to the [0,1] interval to avoid negative values in some methods
             maxVal = min(max(maxVal, 0.0), 1.0)
-            log.debug(
-                "Next best match with value %s (similarity %s) and location (x,y) %s",
-                str(maxVal),
-                similarity,
-                str(maxLoc),
-            )
-
-            if maxVal < similarity:
-                if len(matches) == 0:
-                    self.imglog.similarities.append(maxVal)
-                    self.imglog.locations.append(maxLoc)
-                    current_hotmap = numpy.copy(universal_hotmap)
-                    cv2.circle(
-                        current_hotmap,
-                        (maxLoc[0], maxLoc[1]),
-                        int(30 * maxVal),
-                        (255, 255, 255),
-                    )
-                    self.imglog.hotmaps.append(current_hotmap)
-                    self.imglog.hotmaps.append(final_hotmap)
+            self.imglog.similarities.append(maxVal)
+            self.imglog.locations.append(maxLoc)
+            if log_hotmaps:
+                current_hotmap = numpy.copy(universal_hotmap)
+                cv2.circle(
+                    current_hotmap,
+                    (maxLoc[0], maxLoc[1]),
+                    int(30 * maxVal),
+                    (255, 255, 255),
+                )
+                self.imglog.hotmaps.append(current_hotmap)
+                self.imglog.hotmaps.append(final_hotmap)
 
-                log.debug("Next best match is not acceptable")
-                break
-            else:
-                self.imglog.similarities.append(maxVal)
-                self.imglog.locations.append(maxLoc)
+        for maxVal, maxLoc in peaks:
+            self.imglog.similarities.append(maxVal)
+            self.imglog.locations.append(maxLoc)
+            x, y = maxLoc
+            w, h = scaled_needle.width, scaled_needle.height
+            dx = int(needle.center_offset.x * scale)
+            dy = int(needle.center_offset.y * scale)
+            if log_hotmaps:
                 current_hotmap = numpy.copy(universal_hotmap)
                 cv2.circle(
                     current_hotmap,
@@ -1171,20 +1504,102 @@ class TemplateFinder(Finder):
                     int(30 * maxVal),
                     (255, 255, 255),
                 )
-                x, y = maxLoc
-                w, h = needle.width, needle.height
-                dx, dy = needle.center_offset.x, needle.center_offset.y
                 cv2.rectangle(final_hotmap, (x, y), (x + w, y + h), (0, 0, 0), 2)
                 cv2.rectangle(final_hotmap, (x, y), (x + w, y + h), (255, 255, 255), 1)
                 self.imglog.hotmaps.append(current_hotmap)
-                log.debug("Next best match is acceptable")
-                matches.append(Match(x, y, w, h, dx, dy, maxVal))
-                if similarity == 0.0:
-                    # return just one match if no similarity requirement
-                    break
+            matches.append(Match(x, y, w, h, dx, dy, maxVal))
+
+        log.debug("A total of %i matches found", len(matches))
+        if log_hotmaps:
+            self.imglog.hotmaps.append(final_hotmap)
+        self.imglog.log(30)
+
+        return matches
+
+    def _needle_scales(self) -> list[float]:
+        """
+        EXTRA DOCSTRING: Template matching scales - search order.
+
+        List all needle scales within the configured range starting from
+        the last matched scale and then in order of closeness to the
+        original needle size.
+        """
+        scale_min = self.params["template"]["scale_min"].value
+        scale_max = self.params["template"]["scale_max"].value
+        scale_step = self.params["template"]["scale_step"].value
+        if scale_min >= scale_max or scale_step <= 0.0:
+            return [scale_min]
+
+        scales = []
+        scale = scale_min
+        # the step is accumulated so avoid missing the maximum by rounding errors
+        while scale <= scale_max + 1e-6:
+            scales.append(round(scale, 6))
+            scale += scale_step
+        scales.sort(key=lambda scale: abs(scale - 1.0))
+        if self._last_scale in scales:
+            scales.remove(self._last_scale)
+            scales.insert(0, self._last_scale)
+        return scales
+
+    def _scaled_needle(self, needle: "Image", scale: float) -> "Image":
+        """
+        EXTRA DOCSTRING: Template matching scales - scaled needle.
+
+        Resize the needle image only once for each needle file and scale
+        and reuse the resized needle for all subsequent matching.
+        """
+        if scale == 1.0:
+            return needle
+
+        def compute() -> "Image":
+            import cv2
+            from .target import Image
+
+            width = max(int(round(needle.width * scale)), 1)
+            height = max(int(round(needle.height * scale)), 1)
+            # shrinking requires pixel area averaging for fewer artifacts
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            numpy_array = cv2.resize(
+                needle.numpy_array, (width, height), interpolation=interpolation
+            )
+            return Image(numpy_array=numpy_array)
+
+        return needle.derive("scaled", (scale,), compute)
+
+    def _iterative_peaks(
+        self, result: "Matlike", similarity: float, needle: "Image"
+    ) -> list[tuple[float, tuple[int, int]]]:
+        """
+        EXTRA DOCSTRING: Template matching peaks - one by one extraction.
+
+        Extract the best maximum of the result map, wipe its needle size region,
+        and repeat until the next maximum is not acceptable.
+        """
+        import cv2
+
+        peaks = []
+        res_h, res_w = result.shape[:2]
+        while True:
+            minVal, maxVal, minLoc, maxLoc = cv2.minMaxLoc(result)
+            # rectify to the [0,1] interval to avoid negative values in some methods
+            maxVal = min(max(maxVal, 0.0), 1.0)
+            log.debug(
+                "Next best match with value %s (similarity %s) and location (x,y) %s",
+                str(maxVal),
+                similarity,
+                str(maxLoc),
+            )
+
+            if maxVal < similarity:
+                log.debug("Next best match is not acceptable")
+                break
+            log.debug("Next best match is acceptable")
+            peaks.append((maxVal, (int(maxLoc[0]), int(maxLoc[1]))))
+            if similarity == 0.0:
+                # return just one match if no similarity requirement
+                break
 
-            res_w = haystack.width - needle.width + 1
-            res_h = haystack.height - needle.height + 1
             match_x0 = max(maxLoc[0] - int(0.5 * needle.width), 0)
             match_x1 = min(maxLoc[0] + int(0.5 * needle.width), res_w)
             match_y0 = max(maxLoc[1] - int(0.5 * needle.height), 0)
@@ -1211,12 +1626,51 @@ class TemplateFinder(Finder):
             # clean found image to look for next safe distance match
             result[match_y0:match_y1, match_x0:match_x1] = 0.0
 
-            log.log(9, "Total maxima up to the point are %i", len(matches))
-        log.debug("A total of %i matches found", len(matches))
-        self.imglog.hotmaps.append(final_hotmap)
-        self.imglog.log(30)
+            log.log(9, "Total maxima up to the point are %i", len(peaks))
+        return peaks
 
-        return matches
+    def _vectorized_peaks(
+        self, result: "Matlike", similarity: float, needle: "Image"
+    ) -> list[tuple[float, tuple[int, int]]]:
+        """
+        EXTRA DOCSTRING: Template matching peaks - single pass extraction.
+
+        Threshold the result map and sort all acceptable candidates only once,
+        then accept each candidate outside of the needle size regions of the
+        previously accepted ones. This yields exactly the same peaks as the
+        iterative extraction without rescanning the map for each of them.
+        """
+        import numpy
+
+        res_h, res_w = result.shape[:2]
+        if similarity == 0.0:
+            # return just one match if no similarity requirement
+            index = int(numpy.argmax(result))
+            maxVal = min(max(float(result.flat[index]), 0.0), 1.0)
+            return [(maxVal, (index % res_w, index // res_w))]
+
+        # candidates are in row-major order so a stable sort breaks ties
+        # exactly as the row-major scan of the iterative extraction does
+        candidates = numpy.flatnonzero(result >= similarity)
+        values = result.flat[candidates]
+        order = numpy.argsort(-values, kind="stable")
+        log.log(9, "Extracting peaks among %i candidates", len(candidates))
+
+        peaks = []
+        wiped = numpy.zeros((res_h, res_w), dtype=bool)
+        half_w, half_h = int(0.5 * needle.width), int(0.5 * needle.height)
+        for i in order:
+            y, x = divmod(int(candidates[i]), res_w)
+            if wiped[y, x]:
+                continue
+            maxVal = min(float(values[i]), 1.0)
+            peaks.append((maxVal, (x, y)))
+            wipe_y0, wipe_x0 = max(y - half_h, 0), max(x - half_w, 0)
+            wiped[wipe_y0 : y + half_h, wipe_x0 : x + half_w] = True
+            # the peak itself is never reconsidered even for tiny needles
+            wiped[y, x] = True
+        log.log(9, "Total maxima are %i", len(peaks))
+        return peaks
 
     def _match_template(
         self, needle: "Image", haystack: "Image", nocolor: str, method: str
@@ -1249,18 +1703,190 @@ class TemplateFinder(Finder):
             "ccoeff": cv2.TM_CCOEFF,
             "ccoeff_normed": cv2.TM_CCOEFF_NORMED,
         }
+        pyramid = method.startswith("pyramid_")
+        if pyramid:
+            method = method[len("pyramid_") :]
         if method not in methods.keys():
             raise UnsupportedBackendError("Supported algorithms are in conflict")
 
-        numpy_needle = numpy.array(needle.pil_image)
-        numpy_haystack = numpy.array(haystack.pil_image)
         if nocolor:
-            gray_needle = cv2.cvtColor(numpy_needle, cv2.COLOR_RGB2GRAY)
-            gray_haystack = cv2.cvtColor(numpy_haystack, cv2.COLOR_RGB2GRAY)
-            match = cv2.matchTemplate(gray_haystack, gray_needle, methods[method])
+            numpy_needle = needle.gray_array
+            numpy_haystack = haystack.gray_array
+        else:
+            numpy_needle = needle.numpy_array
+            numpy_haystack = haystack.numpy_array
+        if pyramid:
+            return self._pyramid_match_template(
+                numpy_needle, numpy_haystack, methods[method]
+            )
+        if not self.params["template"]["incremental"].value:
+            return cv2.matchTemplate(numpy_haystack, numpy_needle, methods[method])
+
+        import zlib
+
+        key = (
+            zlib.crc32(numpy_needle),
+            *numpy_needle.shape,
+            *numpy_haystack.shape,
+            methods[method],
+        )
+        if key in self._result_cache:
+            last_haystack, match = self._result_cache.pop(key)
+            match = self._rematch_template(
+                numpy_needle, numpy_haystack, last_haystack, match, methods[method]
+            )
         else:
             match = cv2.matchTemplate(numpy_haystack, numpy_needle, methods[method])
+        self._result_cache[key] = (numpy_haystack, match)
+        self._trim_result_cache()
+
+        # the result is modified by the caller while the cached one must stay intact
+        return match.copy()
+
+    def _trim_result_cache(self) -> None:
+        """
+        EXTRA DOCSTRING: Template matching backend - incremental cache bounds.
+
+        Keep only the most recently used needle and haystack combinations
+        within both a number of entries and a total size in bytes. Haystacks
+        shared among entries (e.g. multiple needles in the same screen) are
+        accounted for only once.
+        """
+        while len(self._result_cache) > 1:
+            haystacks = {id(h): h.nbytes for h, _ in self._result_cache.values()}
+            total_bytes = sum(haystacks.values()) + sum(
+                m.nbytes for _, m in self._result_cache.values()
+            )
+            if (
+                len(self._result_cache) <= self._result_cache_size
+                and total_bytes <= self._result_cache_bytes
+            ):
+                break
+            self._result_cache.pop(next(iter(self._result_cache)))
+
+    def _rematch_template(
+        self,
+        needle: "Matlike",
+        haystack: "Matlike",
+        last_haystack: "Matlike",
+        last_match: "Matlike",
+        method: int,
+    ) -> "Matlike":
+        """
+        EXTRA DOCSTRING: Template matching backend - incremental update.
+
+        Update a previous template matching result only within the dirty
+        rectangles between the previous and the current haystack.
+
+        This is an approximation of a full rematching. The updated scores depend
+        on the same haystack pixels but OpenCV computes them differently for
+        smaller haystacks (other DFT blocks and partial sums for normalization),
+        so they differ from a full rematching by a small numerical error (about
+        1e-7 for ccorr_normed and 2e-4 for ccoeff_normed). Distinct peaks stay
+        the same but the best location within a flat peak or the order of peaks
+        with almost equal scores (e.g. repeated icons) could be different.
+        """
+        import cv2
+        import numpy
+
+        if haystack is last_haystack:
+            return last_match
+        changed = haystack != last_haystack
+        if changed.ndim == 3:
+            changed = changed.any(axis=2)
+        if not changed.any():
+            log.log(9, "Haystack unchanged, reusing previous template matching")
+            return last_match
+
+        _, _, stats, _ = cv2.connectedComponentsWithStats(
+            changed.astype(numpy.uint8), connectivity=8
+        )
+        rects = stats[1:, :4]
+        # too many dirty rectangles are better handled as a single one
+        if len(rects) > 8:
+            x0, y0 = rects[:, 0].min(), rects[:, 1].min()
+            x1 = (rects[:, 0] + rects[:, 2]).max()
+            y1 = (rects[:, 1] + rects[:, 3]).max()
+            rects = [(x0, y0, x1 - x0, y1 - y0)]
+
+        # a haystack pixel affects all result locations up to a needle size before it
+        needle_h, needle_w = needle.shape[:2]
+        match_h, match_w = last_match.shape[:2]
+        updates = []
+        for x, y, w, h in rects:
+            match_x0, match_y0 = max(x - needle_w + 1, 0), max(y - needle_h + 1, 0)
+            match_x1, match_y1 = min(x + w, match_w), min(y + h, match_h)
+            if match_x0 < match_x1 and match_y0 < match_y1:
+                updates.append((match_x0, match_y0, match_x1, match_y1))
+        dirty_area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in updates)
+        if dirty_area > 0.5 * match_w * match_h:
+            log.log(9, "Haystack mostly changed, redoing template matching")
+            return cv2.matchTemplate(haystack, needle, method)
+
+        log.log(9, "Rematching template in dirty rectangles %s", updates)
+        for x0, y0, x1, y1 in updates:
+            haystack_region = haystack[y0 : y1 + needle_h - 1, x0 : x1 + needle_w - 1]
+            last_match[y0:y1, x0:x1] = cv2.matchTemplate(
+                haystack_region, needle, method
+            )
+        return last_match
+
+    def _pyramid_match_template(
+        self, needle: "Matlike", haystack: "Matlike", method: int
+    ) -> "Matlike":
+        """
+        EXTRA DOCSTRING: Template matching backend - coarse-to-fine matching.
+
+        Match a downscaled needle in a downscaled haystack and then match
+        at full resolution only in the neighbourhood of coarse candidates.
+        Locations without candidates get the worst possible result.
+        """
+        import cv2
+        import numpy
+
+        levels = self.params["template"]["pyramid_levels"].value
+        # the needle must remain large enough for a meaningful coarse matching
+        while levels > 0 and min(needle.shape[:2]) >> levels < 8:
+            levels -= 1
+        if levels == 0:
+            log.log(9, "Needle too small for pyramid matching, matching fully")
+            return cv2.matchTemplate(haystack, needle, method)
+
+        coarse_needle, coarse_haystack = needle, haystack
+        for _ in range(levels):
+            coarse_needle = cv2.pyrDown(coarse_needle)
+            coarse_haystack = cv2.pyrDown(coarse_haystack)
+        coarse_match = cv2.matchTemplate(coarse_haystack, coarse_needle, method)
+        if method == cv2.TM_SQDIFF_NORMED:
+            coarse_match = 1.0 - coarse_match
 
+        similarity = self.params["find"]["similarity"].value
+        margin = self.params["template"]["pyramid_margin"].value
+        candidates = (coarse_match >= similarity - margin).astype(numpy.uint8)
+        # the best coarse location is always refined (e.g. for sampling)
+        _, _, _, max_loc = cv2.minMaxLoc(coarse_match)
+        candidates[max_loc[1], max_loc[0]] = 1
+        if candidates.mean() > 0.5:
+            log.log(9, "Too many coarse candidates, matching fully")
+            return cv2.matchTemplate(haystack, needle, method)
+        # each coarse location only approximates the full resolution ones
+        candidates = cv2.dilate(candidates, numpy.ones((3, 3), numpy.uint8))
+
+        scale = 2**levels
+        needle_h, needle_w = needle.shape[:2]
+        match_h = haystack.shape[0] - needle_h + 1
+        match_w = haystack.shape[1] - needle_w + 1
+        worst = 1.0 if method == cv2.TM_SQDIFF_NORMED else 0.0
+        match = numpy.full((match_h, match_w), worst, dtype=numpy.float32)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(candidates, connectivity=8)
+        log.log(9, "Refining %i coarse candidate regions", len(stats) - 1)
+        for x, y, w, h, _ in stats[1:]:
+            x0, y0 = x * scale, y * scale
+            x1, y1 = min((x + w) * scale, match_w), min((y + h) * scale, match_h)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            haystack_region = haystack[y0 : y1 + needle_h - 1, x0 : x1 + needle_w - 1]
+            match[y0:y1, x0:x1] = cv2.matchTemplate(haystack_region, needle, method)
         return match
 
     def log(self, lvl: int) -> None:
@@ -1663,12 +2289,12 @@ class FeatureFinder(Finder):
         import cv2
         import numpy
 
-        ngray = cv2.cvtColor(numpy.array(needle.pil_image), cv2.COLOR_RGB2GRAY)
-        hgray = cv2.cvtColor(numpy.array(haystack.pil_image), cv2.COLOR_RGB2GRAY)
-        self.imglog.hotmaps.append(numpy.array(haystack.pil_image))
-        self.imglog.hotmaps.append(numpy.array(haystack.pil_image))
-        self.imglog.hotmaps.append(numpy.array(haystack.pil_image))
-        self.imglog.hotmaps.append(numpy.array(haystack.pil_image))
+        ngray = needle.gray_array
+        hgray = haystack.gray_array
+        self.imglog.hotmaps.append(haystack.numpy_array.copy())
+        self.imglog.hotmaps.append(haystack.numpy_array.copy())
+        self.imglog.hotmaps.append(haystack.numpy_array.copy())
+        self.imglog.hotmaps.append(haystack.numpy_array.copy())
 
         # project more points for debugging purposes and image logging
         npoints = []
@@ -2173,6 +2799,9 @@ class CascadeFinder(Finder):
         self.params[category]["maxWidth"] = CVParameter(1000, 0, None, 100.0)
         self.params[category]["minHeight"] = CVParameter(0, 0, None, 100.0)
         self.params[category]["maxHeight"] = CVParameter(1000, 0, None, 100.0)
+        # number of tiles along each haystack dimension matched concurrently
+        # (tiles overlap by the maximal size so it should be well below the tile)
+        self.params[category]["tiles"] = CVParameter(1, 1, None)
 
     def configure_backend(
         self, backend: str = None, category: str = "cascade", reset: bool = False
@@ -2196,6 +2825,15 @@ class CascadeFinder(Finder):
 
         See base method for details.
         """
+        if self.params["cascade"]["tiles"].value > 1:
+            overlap = (
+                self.params["cascade"]["maxWidth"].value,
+                self.params["cascade"]["maxHeight"].value,
+            )
+            return self._find_tiles(
+                needle, haystack, "cascade", CascadeFinder.find, overlap
+            )
+
         needle.match_settings = self
         needle.use_own_settings = True
         self.imglog.needle = needle
@@ -2208,10 +2846,8 @@ class CascadeFinder(Finder):
         needle_cascade = cv2.CascadeClassifier(needle.data_file)
         if needle_cascade.empty():
             raise Exception("Could not load the cascade classifier properly")
-        gray_haystack = cv2.cvtColor(
-            numpy.array(haystack.pil_image), cv2.COLOR_RGB2GRAY
-        )
-        canvas = numpy.array(haystack.pil_image)
+        gray_haystack = haystack.gray_array
+        canvas = haystack.numpy_array.copy()
 
         from .match import Match
 
@@ -2257,6 +2893,8 @@ class TextFinder(ContourFinder):
     Neumann L., Matas J.: Real-Time Scene Text Localization and Recognition, CVPR 2012
     """
 
+    _cache = {}
+
     def __init__(self, configure: bool = True, synchronize: bool = True) -> None:
         """Build a CV backend using OpenCV's text matching options."""
         super(TextFinder, self).__init__(configure=False, synchronize=False)
@@ -2290,6 +2928,8 @@ class TextFinder(ContourFinder):
         )
 
         # other attributes
+        self.east_net = None
+        self.east_lock = None
         self.erc1 = None
         self.erf1 = None
         self.erc2 = None
@@ -2614,9 +3254,15 @@ class TextFinder(ContourFinder):
                 self.params["tdetect"]["extra_configs"].value,
             )
         elif category == "tdetect" and backend == "east":
-            self.east_net = cv2.dnn.readNet(
-                os.path.join(datapath, "frozen_east_text_detection.pb")
-            )
+            # reuse already loaded models among all text finders to avoid one model
+            # per sync but serialize their use since model inference is stateful
+            model_path = os.path.join(datapath, "frozen_east_text_detection.pb")
+            if model_path not in self._cache:
+                self._cache[model_path] = (
+                    cv2.dnn.readNet(model_path),
+                    threading.Lock(),
+                )
+            self.east_net, self.east_lock = self._cache[model_path]
         elif category == "tdetect" and backend == "erstat":
             self.erc1 = cv2.text.loadClassifierNM1(
                 os.path.join(datapath, "trained_classifierNM1.xml")
@@ -2814,8 +3460,8 @@ class TextFinder(ContourFinder):
         import numpy
 
         text_needle = needle.value
-        img_haystack = numpy.array(haystack.pil_image)
-        final_hotmap = numpy.array(haystack.pil_image)
+        img_haystack = haystack.numpy_array
+        final_hotmap = haystack.numpy_array.copy()
 
         # detect characters and group them into detected text
         backend = self.params["tdetect"]["backend"]
@@ -2967,7 +3613,7 @@ class TextFinder(ContourFinder):
         import cv2
         import numpy
 
-        detection_img = numpy.array(haystack.pil_image)
+        detection_img = haystack.numpy_array
         if self.params["tdetect"]["binarize_detection"].value:
             detection_img = self._binarize_image(detection_img)
 
@@ -2995,7 +3641,7 @@ class TextFinder(ContourFinder):
         )
 
         char_canvas = detection_img
-        text_canvas = numpy.array(haystack.pil_image)
+        text_canvas = haystack.numpy_array.copy()
         self.imglog.hotmaps.append(char_canvas)
         self.imglog.hotmaps.append(text_canvas)
 
@@ -3059,9 +3705,9 @@ class TextFinder(ContourFinder):
         import cv2
         import numpy
 
-        img = numpy.array(haystack.pil_image)
-        char_canvas = cv2.cvtColor(numpy.array(haystack.pil_image), cv2.COLOR_RGB2GRAY)
-        text_canvas = numpy.array(haystack.pil_image)
+        img = haystack.numpy_array.copy()
+        char_canvas = haystack.gray_array.copy()
+        text_canvas = haystack.numpy_array.copy()
         self.imglog.hotmaps.append(char_canvas)
         self.imglog.hotmaps.append(text_canvas)
 
@@ -3078,12 +3724,12 @@ class TextFinder(ContourFinder):
         inp = cv2.dnn.blobFromImage(
             img, mean=(123.68, 116.78, 103.94), swapRB=True, crop=False
         )
-        self.east_net.setInput(inp)
-
         # select two output layers for the EAST detector model respectivelly for
         # the output probabilities and the text bounding box coordinates
         output_layers = ["feature_fusion/Conv_7/Sigmoid", "feature_fusion/concat_3"]
-        probability, geometry = self.east_net.forward(output_layers)
+        with self.east_lock:
+            self.east_net.setInput(inp)
+            probability, geometry = self.east_net.forward(output_layers)
         char_canvas[:] = cv2.resize(
             probability[0, 0] * 255.0, (char_canvas.shape[1], char_canvas.shape[0])
         )
@@ -3195,9 +3841,9 @@ class TextFinder(ContourFinder):
         import cv2
         import numpy
 
-        img = numpy.array(haystack.pil_image)
-        char_canvas = numpy.array(haystack.pil_image)
-        text_canvas = numpy.array(haystack.pil_image)
+        img = haystack.numpy_array.copy()
+        char_canvas = haystack.numpy_array.copy()
+        text_canvas = haystack.numpy_array.copy()
         self.imglog.hotmaps.append(char_canvas)
         self.imglog.hotmaps.append(text_canvas)
 
@@ -3307,9 +3953,9 @@ class TextFinder(ContourFinder):
         import cv2
         import numpy
 
-        img = numpy.array(haystack.pil_image)
-        char_canvas = numpy.array(haystack.pil_image)
-        text_canvas = numpy.array(haystack.pil_image)
+        img = haystack.numpy_array.copy()
+        char_canvas = haystack.numpy_array.copy()
+        text_canvas = haystack.numpy_array.copy()
         self.imglog.hotmaps.append(char_canvas)
         self.imglog.hotmaps.append(text_canvas)
 
@@ -3410,9 +4056,9 @@ class TextFinder(ContourFinder):
         import cv2
         import numpy
 
-        img = numpy.array(haystack.pil_image)
-        char_canvas = numpy.array(haystack.pil_image)
-        text_canvas = numpy.array(haystack.pil_image)
+        img = haystack.numpy_array.copy()
+        char_canvas = haystack.numpy_array.copy()
+        text_canvas = haystack.numpy_array.copy()
         self.imglog.hotmaps.append(char_canvas)
         self.imglog.hotmaps.append(text_canvas)
 
@@ -3680,9 +4326,9 @@ class TemplateFeatureFinder(TemplateFinder, FeatureFinder):
         self.params["find"]["similarity"].value = feature_similarity
         # dump correct matching settings
         self.imglog.dump_matched_images()
-        ngray = cv2.cvtColor(numpy.array(needle.pil_image), cv2.COLOR_RGB2GRAY)
-        hgray = cv2.cvtColor(numpy.array(haystack.pil_image), cv2.COLOR_RGB2GRAY)
-        final_hotmap = numpy.array(haystack.pil_image)
+        ngray = needle.gray_array
+        hgray = haystack.gray_array
+        final_hotmap = haystack.numpy_array.copy()
 
         frame_points = [(0, 0)]
         feature_maxima = []
@@ -3779,7 +4425,7 @@ class TemplateFeatureFinder(TemplateFinder, FeatureFinder):
                 self.imglog.locations.append(
                     self.imglog.locations[len(template_maxima)]
                 )
-            elif len(self.imglog.similarities) == 1:
+            elif len(self.imglog.similarities) == 1 and len(self.imglog.hotmaps) > 0:
                 # NOTE: we are only interested in the template hotmap on template failure
                 self.imglog.hotmaps.append(self.imglog.hotmaps[0])
             self.imglog.log(30)
@@ -4186,8 +4832,18 @@ class HybridFinder(Finder):
     unique or repeating matchers for each step. If a step fails, the matcher
     tries the next available along the fallback chain or fails if the end of
     the chain is reached.
+
+    If the strict order of the chain steps is relaxed, steps that are cheap
+    and frequently successful are tried first based on statistics persisted
+    in a stats file next to the steps file of the chain.
     """
 
+    # step statistics of all chains shared among all hybrid matchers
+    _stats: dict[str, dict[str, dict[str, float]]] = {}
+    # number of successful finds since the statistics were last persisted
+    _stats_unsaved: dict[str, int] = {}
+    _stats_lock = threading.Lock()
+
     def __init__(self, configure: bool = True, synchronize: bool = True) -> None:
         """Build a hybrid matcher."""
         super(HybridFinder, self).__init__(configure=False, synchronize=False)
@@ -4231,6 +4887,12 @@ class HybridFinder(Finder):
 
         self.params[category] = {}
         self.params[category]["backend"] = backend
+        # number of chain steps evaluated concurrently (first step in order wins)
+        self.params[category]["workers"] = CVParameter(1, 1, None)
+        # whether to keep the chain order or to reorder steps by hit rate and cost
+        self.params[category]["strict_order"] = CVParameter(True)
+        # number of successful finds after which the step statistics are persisted
+        self.params[category]["stats_interval"] = CVParameter(10, 1, None)
 
     def configure_backend(
         self, backend: str = None, category: str = "hybrid", reset: bool = False
@@ -4304,17 +4966,255 @@ class HybridFinder(Finder):
             log.debug("Defaulting to one step chain %s", needle)
             needle = [needle]
 
-        for step_needle in needle:
-
+        steps = list(needle)
+        matchers = []
+        for step_needle in steps:
             if step_needle.use_own_settings and not isinstance(
                 step_needle.match_settings, HybridFinder
             ):
-                matcher = step_needle.match_settings
+                matchers.append(step_needle.match_settings)
             else:
-                matcher = self.matcher
+                matchers.append(self.matcher)
+
+        keys = self._step_keys(needle)
+        stats = self._chain_stats(needle)
+        if stats is not None:
+            order = self._adaptive_order(keys, stats)
+            log.log(9, "Reordered chain steps to %s", [i + 1 for i in order])
+            steps = [steps[i] for i in order]
+            matchers = [matchers[i] for i in order]
+            keys = [keys[i] for i in order]
+
+        workers = self.params["hybrid"]["workers"].value
+        if workers > 1 and len(steps) > 1:
+            matches = self._parallel_find(
+                steps, matchers, haystack, workers, stats, keys
+            )
+        else:
+            matches = []
+            for step_needle, matcher, key in zip(steps, matchers, keys):
+                matches = self._find_step(step_needle, matcher, haystack, stats, key)
+                if len(matches) > 0:
+                    break
 
-            matches = matcher.find(step_needle, haystack)
-            if len(matches) > 0:
-                return matches
+        # statistics of unsuccessful steps are persisted with a later success
+        if stats is not None and len(matches) > 0:
+            self._save_chain_stats(
+                needle, self.params["hybrid"]["stats_interval"].value
+            )
+        return matches
 
-        return []
+    def _find_step(
+        self,
+        step: "Target",
+        matcher: Finder,
+        haystack: "Image",
+        stats: dict[str, dict[str, float]] | None,
+        key: str,
+    ) -> "list[Match]":
+        """
+        EXTRA DOCSTRING: Hybrid matching - single chain step.
+
+        Find a chain step recording its hits and duration under the step key
+        if needed.
+        """
+        if stats is None:
+            return matcher.find(step, haystack)
+        start_time = time.time()
+        matches = matcher.find(step, haystack)
+        duration = time.time() - start_time
+        with self._stats_lock:
+            step_stats = stats.setdefault(key, {"attempts": 0, "hits": 0, "time": 0.0})
+            step_stats["attempts"] += 1
+            step_stats["hits"] += 1 if len(matches) > 0 else 0
+            step_stats["time"] += duration
+        return matches
+
+    def _step_keys(self, needle: "Target") -> list[str]:
+        """
+        EXTRA DOCSTRING: Hybrid matching - step statistics.
+
+        Identify the steps of a chain by their position, target, and match
+        configuration file so that steps of the same target matched in a
+        different way have separate statistics.
+        """
+        from .target import Chain
+
+        if not isinstance(needle, Chain):
+            return [str(step) for step in needle]
+        return [
+            "%i:%s:%s" % (i + 1, step, config)
+            for i, (step, config) in enumerate(zip(needle, needle.step_configs))
+        ]
+
+    def _chain_stats(self, needle: "Target") -> dict[str, dict[str, float]] | None:
+        """
+        EXTRA DOCSTRING: Hybrid matching - step statistics.
+
+        Load the statistics of all steps of a chain loaded from a steps file
+        unless the chain order is strict. Unreadable statistics are discarded
+        so that the steps are tried in chain order until new ones are collected.
+        """
+        from .target import Chain
+
+        if self.params["hybrid"]["strict_order"].value:
+            return None
+        if not isinstance(needle, Chain) or needle.filename is None:
+            return None
+        stats_filename = os.path.splitext(needle.filename)[0] + ".stats"
+        with self._stats_lock:
+            if stats_filename not in self._stats:
+                stats = {}
+                try:
+                    if os.path.exists(stats_filename):
+                        with open(stats_filename) as f:
+                            stats = json.load(f)
+                    if not isinstance(stats, dict):
+                        raise ValueError("Statistics are not a JSON object")
+                except (OSError, ValueError) as error:
+                    log.warning(
+                        "Could not load chain step statistics from %s: %s",
+                        stats_filename,
+                        error,
+                    )
+                    stats = {}
+                if len(self._stats) == 0:
+                    # persist any statistics collected since the last save
+                    atexit.register(HybridFinder._flush_chain_stats)
+                self._stats[stats_filename] = stats
+            return self._stats[stats_filename]
+
+    def _save_chain_stats(self, needle: "Target", interval: int = 1) -> None:
+        """
+        EXTRA DOCSTRING: Hybrid matching - step statistics.
+
+        Persist the statistics of all steps of a chain next to its steps file
+        once for a number of successful finds to keep disk writes off most finds.
+        """
+        stats_filename = os.path.splitext(needle.filename)[0] + ".stats"
+        with self._stats_lock:
+            unsaved = self._stats_unsaved.get(stats_filename, 0) + 1
+            if unsaved < interval:
+                self._stats_unsaved[stats_filename] = unsaved
+                return
+            self._stats_unsaved[stats_filename] = 0
+            data = json.dumps(self._stats[stats_filename], indent=4)
+        HybridFinder._write_chain_stats(stats_filename, data)
+
+    @staticmethod
+    def _flush_chain_stats() -> None:
+        """
+        EXTRA DOCSTRING: Hybrid matching - step statistics.
+
+        Persist the statistics of all chains with any unsaved finds.
+        """
+        with HybridFinder._stats_lock:
+            unsaved = [
+                (
+                    stats_filename,
+                    json.dumps(HybridFinder._stats[stats_filename], indent=4),
+                )
+                for stats_filename, count in HybridFinder._stats_unsaved.items()
+                if count > 0
+            ]
+            HybridFinder._stats_unsaved.clear()
+        for stats_filename, data in unsaved:
+            HybridFinder._write_chain_stats(stats_filename, data)
+
+    @staticmethod
+    def _write_chain_stats(stats_filename: str, data: str) -> None:
+        """
+        EXTRA DOCSTRING: Hybrid matching - step statistics.
+
+        Write the statistics atomically through a temporary file of this
+        process so that no process ever reads partially written statistics.
+        """
+        from tempfile import NamedTemporaryFile
+
+        temp_filename = None
+        try:
+            with NamedTemporaryFile(
+                "w",
+                dir=os.path.dirname(os.path.abspath(stats_filename)),
+                prefix=os.path.basename(stats_filename),
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                temp_filename = f.name
+                f.write(data)
+            os.replace(temp_filename, stats_filename)
+        except OSError as error:
+            log.warning("Could not save chain step statistics: %s", error)
+            if temp_filename is not None and os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+
+    def _adaptive_order(
+        self, keys: list[str], stats: dict[str, dict[str, float]]
+    ) -> list[int]:
+        """
+        EXTRA DOCSTRING: Hybrid matching - adaptive step order.
+
+        Order the steps by their expected duration per hit so that cheap and
+        frequently successful steps are tried first. Steps without statistics
+        are tried first and all ties are kept in chain order.
+        """
+
+        def cost(i: int) -> float:
+            step_stats = stats.get(keys[i], None)
+            if step_stats is None or step_stats["attempts"] == 0:
+                return 0.0
+            # smoothed hit rate to avoid dropping steps that never hit so far
+            hit_rate = (step_stats["hits"] + 1) / (step_stats["attempts"] + 2)
+            mean_time = step_stats["time"] / step_stats["attempts"]
+            return mean_time / hit_rate
+
+        return sorted(range(len(keys)), key=cost)
+
+    def _parallel_find(
+        self,
+        steps: "list[Target]",
+        matchers: list[Finder],
+        haystack: "Image",
+        workers: int,
+        stats: dict[str, dict[str, float]] | None = None,
+        keys: list[str] | None = None,
+    ) -> "list[Match]":
+        """
+        EXTRA DOCSTRING: Hybrid matching - concurrent chain steps.
+
+        Evaluate chain steps on a pool of threads while steps sharing the
+        same matcher are still evaluated in order by the same thread. The
+        first step in chain order with any matches wins and no step after
+        an already successful one is evaluated.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        groups: dict[int, list[int]] = {}
+        for i, matcher in enumerate(matchers):
+            groups.setdefault(id(matcher), []).append(i)
+        log.debug("Evaluating %i chain steps in %i groups", len(steps), len(groups))
+
+        keys = [str(step) for step in steps] if keys is None else keys
+        best: list[Any] = [len(steps), []]
+        lock = threading.Lock()
+
+        def evaluate(indices: list[int]) -> None:
+            for i in indices:
+                # steps after an already successful one can never win
+                if i > best[0]:
+                    return
+                matches = self._find_step(
+                    steps[i], matchers[i], haystack, stats, keys[i]
+                )
+                if len(matches) > 0:
+                    with lock:
+                        if i < best[0]:
+                            best[:] = [i, matches]
+                    return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results to propagate any exceptions
+            list(executor.map(evaluate, groups.values()))
+        if best[0] < len(steps):
+            log.debug("Chain step %i matched first", best[0] + 1)
+        return best[1]
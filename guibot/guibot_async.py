@@ -0,0 +1,310 @@
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Asynchronous guibot interface for driving many screens from one event loop.
+
+SUMMARY
+------------------------------------------------------
+
+Frontend with coroutine counterparts of the most common region methods. All
+blocking screen captures, target matching, and display control are delegated
+to an executor while any waiting in between polls is done with `asyncio.sleep`
+so that a single event loop can drive multiple regions (e.g. on multiple VNC
+screens) concurrently. For information about the API please refer to
+:py:class:`guibot.GuiBot` and :py:class:`region.Region`.
+
+INTERFACE
+------------------------------------------------------
+
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from collections.abc import Generator
+from typing import Any, Callable
+
+from .guibot import GuiBot
+from .region import Region
+from .finder import Finder
+from .controller import Controller
+from .location import Location
+from .target import Target
+from .errors import *
+
+log = logging.getLogger("guibot.async")
+
+
+def _poll(polls: Generator[float, None, Any]) -> tuple[bool, Any]:
+    # a StopIteration cannot be propagated through an executor future
+    try:
+        return False, next(polls)
+    except StopIteration as result:
+        return True, result.value
+
+
+class AsyncRegion(object):
+    """
+    Asynchronous counterpart of a region of the screen.
+
+    .. seealso:: Real API is delegated to :py:class:`region.Region`.
+    """
+
+    def __init__(self, region: Region = None, executor: Executor = None) -> None:
+        """
+        Build an asynchronous region object.
+
+        :param region: region to delegate all blocking operations to or
+                       a new full screen region if none is provided
+        :param executor: executor for blocking operations or None for the
+                         default executor of the running event loop
+
+        The wrapped region remains available for any synchronous calls.
+        """
+        self.region = Region() if region is None else region
+        self.executor = executor
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(self.executor, call)
+
+    async def _run_polls(self, polls: Generator[float, None, Any]) -> Any:
+        while True:
+            done, value = await self._run(_poll, polls)
+            if done:
+                return value
+            await asyncio.sleep(value)
+
+    async def find(self, target: str | Target, timeout: int = 10) -> "Match":
+        """
+        Find a target on the screen.
+
+        See :py:func:`region.Region.find` for details.
+        """
+        polls = self.region._find_all_polls(
+            target, timeout, allow_zero=False, near_last=True
+        )
+        matches = await self._run_polls(polls)
+        return matches[0]
+
+    async def find_all(
+        self, target: str | Target, timeout: int = 10, allow_zero: bool = False
+    ) -> "list[Match]":
+        """
+        Find multiples of a target on the screen.
+
+        See :py:func:`region.Region.find_all` for details.
+        """
+        polls = self.region._find_all_polls(target, timeout, allow_zero)
+        return await self._run_polls(polls)
+
+    async def find_any(
+        self, targets: list[str | Target], timeout: int = 10, workers: int = 1
+    ) -> "list[list[Match]]":
+        """
+        Find any of multiple targets on the screen.
+
+        See :py:func:`region.Region.find_any` for details.
+        """
+        polls = self.region._find_any_polls(targets, timeout, workers)
+        return await self._run_polls(polls)
+
+    async def exists(self, target: str | Target, timeout: int = 0) -> "Match | None":
+        """
+        Check if a target exists on the screen using similarity as a threshold.
+
+        See :py:func:`region.Region.exists` for details.
+        """
+        log.info("Checking if %s is present", target)
+        try:
+            return await self.find(target, timeout)
+        except FindError:
+            log.info("%s is not present", target)
+        return None
+
+    async def wait(self, target: str | Target, timeout: int = 30) -> "Match":
+        """
+        Wait for a target to appear (be matched) with a given timeout as failing tolerance.
+
+        See :py:func:`region.Region.wait` for details.
+        """
+        log.info("Waiting for %s", target)
+        return await self.find(target, timeout)
+
+    async def wait_any(
+        self, targets: list[str | Target], timeout: int = 30, workers: int = 1
+    ) -> "list[list[Match]]":
+        """
+        Wait for any of multiple targets to appear with a given timeout as failing tolerance.
+
+        See :py:func:`region.Region.wait_any` for details.
+        """
+        log.info("Waiting for any of %s", ", ".join(map(str, targets)))
+        return await self.find_any(targets, timeout, workers)
+
+    async def wait_vanish(
+        self, target: str | Target, timeout: int = 30
+    ) -> "AsyncRegion":
+        """
+        Wait for a target to disappear (be unmatched) with a given timeout as failing tolerance.
+
+        See :py:func:`region.Region.wait_vanish` for details.
+        """
+        log.info("Waiting for %s to vanish", target)
+        await self._run_polls(self.region._unfind_polls(target, timeout))
+        return self
+
+    async def idle(self, timeout: int) -> "AsyncRegion":
+        """
+        Wait for a number of seconds without blocking the event loop.
+
+        See :py:func:`region.Region.idle` for details.
+        """
+        log.debug("Waiting for %ss", timeout)
+        await asyncio.sleep(timeout)
+        return self
+
+    async def hover(
+        self, target_or_location: "Match | Location | str | Target"
+    ) -> "Match | None":
+        """
+        Hover the mouse over a target or location.
+
+        See :py:func:`region.Region.hover` for details.
+        """
+        from .match import Match
+
+        if isinstance(target_or_location, (Match, Location)):
+            # no target finding is needed
+            await self._run(self.region.hover, target_or_location)
+            return None
+
+        match = await self.find(target_or_location)
+        await self._run(self.region.hover, match)
+        return match
+
+    async def click(
+        self,
+        target_or_location: "Match | Location | str | Target",
+        modifiers: list[str] = None,
+    ) -> "Match | None":
+        """
+        Click on a target or location using the left mouse button.
+
+        See :py:func:`region.Region.click` for details.
+        """
+        match = await self.hover(target_or_location)
+        log.info("Clicking at %s", target_or_location)
+        if modifiers is not None:
+            log.info("Holding the modifiers %s", " ".join(modifiers))
+        dc_backend = self.region.dc_backend
+        await self._run(dc_backend.mouse_click, self.region.LEFT_BUTTON, 1, modifiers)
+        return match
+
+    async def right_click(
+        self,
+        target_or_location: "Match | Location | str | Target",
+        modifiers: list[str] = None,
+    ) -> "Match | None":
+        """
+        Click on a target or location using the right mouse button.
+
+        See :py:func:`region.Region.right_click` for details.
+        """
+        match = await self.hover(target_or_location)
+        log.info("Right clicking at %s", target_or_location)
+        if modifiers is not None:
+            log.info("Holding the modifiers %s", " ".join(modifiers))
+        dc_backend = self.region.dc_backend
+        await self._run(dc_backend.mouse_click, self.region.RIGHT_BUTTON, 1, modifiers)
+        return match
+
+    async def double_click(
+        self,
+        target_or_location: "Match | Location | str | Target",
+        modifiers: list[str] = None,
+    ) -> "Match | None":
+        """
+        Double click on a target or location using the left mouse button.
+
+        See :py:func:`region.Region.double_click` for details.
+        """
+        match = await self.hover(target_or_location)
+        log.info("Double clicking at %s", target_or_location)
+        if modifiers is not None:
+            log.info("Holding the modifiers %s", " ".join(modifiers))
+        dc_backend = self.region.dc_backend
+        await self._run(dc_backend.mouse_click, self.region.LEFT_BUTTON, 2, modifiers)
+        return match
+
+    async def press_keys(self, keys: str | list[str]) -> "AsyncRegion":
+        """
+        Press a single key or a list of keys simultaneously.
+
+        See :py:func:`region.Region.press_keys` for details.
+        """
+        await self._run(self.region.press_keys, keys)
+        return self
+
+    async def type_text(
+        self, text: list[str] | str, modifiers: list[str] = None
+    ) -> "AsyncRegion":
+        """
+        Type a list of consecutive character keys (without special keys).
+
+        See :py:func:`region.Region.type_text` for details.
+        """
+        await self._run(self.region.type_text, text, modifiers)
+        return self
+
+
+class AsyncGuiBot(AsyncRegion):
+    """
+    Asynchronous counterpart of the main guibot object.
+
+    .. seealso:: Real API is delegated to :py:class:`guibot.GuiBot`.
+    """
+
+    def __init__(
+        self, dc: Controller = None, cv: Finder = None, executor: Executor = None
+    ) -> None:
+        """
+        Build an asynchronous guibot object.
+
+        :param dc: DC backend used for any display control
+        :param cv: CV backend used for any target finding
+        :param executor: executor for blocking operations or None for the
+                         default executor of the running event loop
+        """
+        super(AsyncGuiBot, self).__init__(GuiBot(dc=dc, cv=cv), executor)
+
+    def add_path(self, directory: str) -> None:
+        """
+        Add a path to the list of currently accessible paths if it wasn't already added.
+
+        :param directory: path to add
+        """
+        self.region.add_path(directory)
+
+    def remove_path(self, directory: str) -> None:
+        """
+        Remove a path from the list of currently accessible paths.
+
+        :param directory: path to add
+        """
+        self.region.remove_path(directory)
@@ -152,6 +152,16 @@ class GuiBotProxy(GuiBot):
             proxified.append(self._proxify(match))
         return proxified
 
+    def find_any(
+        self, *args: tuple[type, ...], **kwargs: dict[str, type]
+    ) -> list[list[str]]:
+        """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
+        all_matches = super(GuiBotProxy, self).find_any(*args, **kwargs)
+        proxified = []
+        for matches in all_matches:
+            proxified.append([self._proxify(match) for match in matches])
+        return proxified
+
     def sample(self, *args: tuple[type, ...], **kwargs: dict[str, type]) -> str:
         """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
         return self._proxify(super(GuiBotProxy, self).sample(*args, **kwargs))
@@ -164,6 +174,16 @@ class GuiBotProxy(GuiBot):
         """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
         return self._proxify(super(GuiBotProxy, self).wait(*args, **kwargs))
 
+    def wait_any(
+        self, *args: tuple[type, ...], **kwargs: dict[str, type]
+    ) -> list[list[str]]:
+        """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
+        all_matches = super(GuiBotProxy, self).wait_any(*args, **kwargs)
+        proxified = []
+        for matches in all_matches:
+            proxified.append([self._proxify(match) for match in matches])
+        return proxified
+
     def wait_vanish(self, *args: tuple[type, ...], **kwargs: dict[str, type]) -> str:
         """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
         return self._proxify(super(GuiBotProxy, self).wait_vanish(*args, **kwargs))
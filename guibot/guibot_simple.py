@@ -87,6 +87,12 @@ def find_all(*args: tuple[type, ...], **kwargs: dict[str, type]) -> list[Match]:
     return guibot.find_all(*args, **kwargs)
 
 
+def find_any(*args: tuple[type, ...], **kwargs: dict[str, type]) -> list[list[Match]]:
+    """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
+    check_initialized()
+    return guibot.find_any(*args, **kwargs)
+
+
 def sample(*args: tuple[type, ...], **kwargs: dict[str, type]) -> float:
     """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
     check_initialized()
@@ -105,6 +111,12 @@ def wait(*args: tuple[type, ...], **kwargs: dict[str, type]) -> Region:
     return guibot.wait(*args, **kwargs)
 
 
+def wait_any(*args: tuple[type, ...], **kwargs: dict[str, type]) -> list[list[Match]]:
+    """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
+    check_initialized()
+    return guibot.wait_any(*args, **kwargs)
+
+
 def wait_vanish(*args: tuple[type, ...], **kwargs: dict[str, type]) -> Region:
     """See :py:class:`guibot.guibot.GuiBot` and its inherited :py:class:`guibot.region.Region` for details."""
     check_initialized()
@@ -31,7 +31,9 @@ INTERFACE
 
 import time
 import os
+import math
 import logging
+from typing import Any, Generator
 
 # interconnected classes - carefully avoid circular reference
 from .config import GlobalConfig
@@ -41,6 +43,7 @@ from .errors import *
 from .target import *
 from .finder import *
 from .controller import *
+from .atlas import LocationAtlas
 
 log = logging.getLogger("guibot.region")
 
@@ -112,6 +115,7 @@ class Region(object):
         self.default_target_type = Image
 
         self._last_match = None
+        self._last_locations: dict[str, tuple[int, int, int, int]] = {}
         self._xpos = xpos
         self._ypos = ypos
 
@@ -429,8 +433,8 @@ class Region(object):
         This method is the main entrance to all our target finding capabilities
         and is the milestone for all target expect methods.
         """
-        matches = self.find_all(target, timeout=timeout, allow_zero=False)
-        return matches[0]
+        polls = self._find_all_polls(target, timeout, allow_zero=False, near_last=True)
+        return self._run_polls(polls)[0]
 
     def find_all(
         self, target: str | Target, timeout: int = 10, allow_zero: bool = False
@@ -447,20 +451,61 @@ class Region(object):
 
         This method is similar the one above but allows for more than one match.
         """
+        return self._run_polls(self._find_all_polls(target, timeout, allow_zero))
+
+    def _run_polls(self, polls: Generator[float, None, Any]) -> Any:
+        """
+        Run all polls of a polling generator sleeping in between.
+
+        :param polls: generator yielding the delay before its next poll
+        :returns: the final return value of the generator
+        """
+        while True:
+            try:
+                delay = next(polls)
+            except StopIteration as result:
+                return result.value
+            time.sleep(delay)
+
+    def _find_all_polls(
+        self,
+        target: str | Target,
+        timeout: int = 10,
+        allow_zero: bool = False,
+        near_last: bool = False,
+    ) -> "Generator[float, None, list[Match]]":
         if isinstance(target, str):
             target = self._target_from_string(target)
         log.debug("Looking for targets %s", target)
         cv_backend = self._determine_cv_backend(target)
         dc_backend = self.dc_backend
 
+        # only a single best match is needed for a search near the last match
+        if near_last and GlobalConfig.wait_for_animations is not True:
+            matches = []
+            if GlobalConfig.search_near_last_match is True:
+                matches = self._find_near_last_match(target, cv_backend)
+            if len(matches) == 0 and GlobalConfig.location_atlas != "":
+                matches = self._find_atlas_match(target, cv_backend)
+            if len(matches) > 0:
+                return matches
+
         # TODO: decide about updating the last_match attribute
         last_matches = []
         moving_targets = True
+        last_fingerprint = None
+        relative_matches = []
         timeout_limit = time.time() + timeout
         while True:
             screen_capture = dc_backend.capture_screen(self)
 
-            relative_matches = cv_backend.find(target, screen_capture)
+            # matching the same screen again would only yield the same matches
+            fingerprint = self._fingerprint(screen_capture)
+            if fingerprint != last_fingerprint:
+                relative_matches = cv_backend.find(target, screen_capture)
+                last_fingerprint = fingerprint
+            else:
+                log.debug("Screen unchanged, reusing previous matches")
             if len(relative_matches) > 0:
                 from .match import Match
 
@@ -490,6 +535,7 @@ class Region(object):
                         last_matches.append(new_match)
                 self._last_match = last_matches[-1]
                 if GlobalConfig.wait_for_animations is not True or not moving_targets:
+                    self._remember_match(target, last_matches[0])
                     return last_matches
 
             elif time.time() > timeout_limit:
@@ -512,7 +558,218 @@ class Region(object):
 
             else:
                 # don't hog the CPU
-                time.sleep(GlobalConfig.rescan_speed_on_find)
+                yield GlobalConfig.rescan_speed_on_find
+
+    def find_any(
+        self, targets: list[str | Target], timeout: int = 10, workers: int = 1
+    ) -> "list[list[Match]]":
+        """
+        Find any of multiple targets on the screen.
+
+        :param targets: targets to look for
+        :param timeout: timeout before giving up
+        :param workers: number of targets matched concurrently
+        :returns: matches obtained from finding each of the targets within
+                  the region in the same order (empty for missing targets)
+        :raises: :py:class:`errors.FindError` if none of the targets is found
+
+        This method is similar to the one above but captures the screen only
+        once for each poll to match all targets on the same screen capture.
+        """
+        return self._run_polls(self._find_any_polls(targets, timeout, workers))
+
+    def _find_any_polls(
+        self, targets: list[str | Target], timeout: int = 10, workers: int = 1
+    ) -> "Generator[float, None, list[list[Match]]]":
+        targets = [
+            self._target_from_string(target) if isinstance(target, str) else target
+            for target in targets
+        ]
+        log.debug("Looking for any of the targets %s", ", ".join(map(str, targets)))
+        # targets matched by the same CV backend are matched together
+        batches: dict[int, tuple[Finder, list[int]]] = {}
+        for i, target in enumerate(targets):
+            cv_backend = self._determine_cv_backend(target)
+            batches.setdefault(id(cv_backend), (cv_backend, []))[1].append(i)
+        # batches use distinct CV backends and can thus be matched concurrently
+        # with the workers shared among them
+        batch_workers = max(1, workers // max(len(batches), 1))
+        dc_backend = self.dc_backend
+
+        def find_batch(batch: tuple[Finder, list[int]]) -> "list[list[Match]]":
+            cv_backend, indices = batch
+            needles = [targets[i] for i in indices]
+            return cv_backend.find_many(needles, screen_capture, batch_workers)
+
+        last_fingerprint = None
+        timeout_limit = time.time() + timeout
+        while True:
+            screen_capture = dc_backend.capture_screen(self)
+
+            # matching the same screen again would only yield the same matches
+            fingerprint = self._fingerprint(screen_capture)
+            if fingerprint != last_fingerprint:
+                from .match import Match
+
+                all_matches = [[] for _ in targets]
+                concurrent = min(workers, len(batches))
+                if concurrent <= 1:
+                    results = [find_batch(batch) for batch in batches.values()]
+                else:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    with ThreadPoolExecutor(max_workers=concurrent) as executor:
+                        results = list(executor.map(find_batch, batches.values()))
+                for (cv_backend, indices), batch in zip(batches.values(), results):
+                    for i, relative_matches in zip(indices, batch):
+                        all_matches[i] = [
+                            Match(
+                                match.x + self.x,
+                                match.y + self.y,
+                                match.width,
+                                match.height,
+                                match.dx,
+                                match.dy,
+                                match.similarity,
+                                dc=dc_backend,
+                                cv=cv_backend,
+                            )
+                            for match in relative_matches
+                        ]
+                matched = [matches for matches in all_matches if len(matches) > 0]
+                if len(matched) > 0:
+                    self._last_match = matched[0][-1]
+                    return all_matches
+                last_fingerprint = fingerprint
+            else:
+                log.debug("Screen unchanged, none of the targets is present")
+
+            if time.time() > timeout_limit:
+                raise FindError(", ".join(map(str, targets)))
+            # don't hog the CPU
+            yield GlobalConfig.rescan_speed_on_find
+
+    def _find_near_last_match(
+        self, target: Target, cv_backend: "Finder"
+    ) -> "list[Match]":
+        key = self._target_key(target)
+        if key not in self._last_locations:
+            return []
+        x, y, width, height = self._last_locations[key]
+        growth: float = GlobalConfig.near_match_window_growth
+
+        from .match import Match
+
+        margin_x, margin_y = width, height
+        # a few growing windows are worth it before searching the entire region
+        for _ in range(10):
+            x0, y0 = max(x - margin_x, self.x), max(y - margin_y, self.y)
+            x1 = min(x + width + margin_x, self.x + self.width)
+            y1 = min(y + height + margin_y, self.y + self.height)
+            # large windows are not worth it compared to the entire region
+            if (x1 - x0) * (y1 - y0) > 0.5 * self.width * self.height:
+                break
+            log.debug("Looking for %s near its last match in %s", target, (x0, y0))
+            window_capture = self.dc_backend.capture_screen(x0, y0, x1 - x0, y1 - y0)
+            relative_matches = cv_backend.find(target, window_capture)
+            if len(relative_matches) > 0:
+                matches = [
+                    Match(
+                        match.x + x0,
+                        match.y + y0,
+                        match.width,
+                        match.height,
+                        match.dx,
+                        match.dy,
+                        match.similarity,
+                        dc=self.dc_backend,
+                        cv=cv_backend,
+                    )
+                    for match in relative_matches
+                ]
+                self._last_match = matches[-1]
+                self._remember_match(target, matches[0])
+                return matches
+            if growth <= 1.0:
+                break
+            # grow by at least a pixel even for small margins and growth factors
+            margin_x = max(margin_x + 1, math.ceil(margin_x * growth))
+            margin_y = max(margin_y + 1, math.ceil(margin_y * growth))
+
+        log.debug("%s not found near its last match, searching entire region", target)
+        return []
+
+    def _find_atlas_match(self, target: Target, cv_backend: "Finder") -> "list[Match]":
+        key = self._atlas_key(target)
+        if key is None:
+            return []
+        atlas = LocationAtlas.from_file(GlobalConfig.location_atlas)
+        location = atlas.lookup(key)
+        if location is None:
+            return []
+        (x, y, width, height), similarity = location
+
+        # a single capture and matching of the previous match box only
+        log.debug("Verifying %s at its atlas location %s", target, (x, y))
+        box_capture = self.dc_backend.capture_screen(x, y, width, height)
+        relative_matches = cv_backend.find(target, box_capture)
+        if len(relative_matches) == 0:
+            log.debug("%s not found at its atlas location", target)
+            return []
+
+        from .match import Match
+
+        match = relative_matches[0]
+        match = Match(
+            match.x + x,
+            match.y + y,
+            match.width,
+            match.height,
+            match.dx,
+            match.dy,
+            match.similarity,
+            dc=self.dc_backend,
+            cv=cv_backend,
+        )
+        log.debug(
+            "%s found at its atlas location with similarity %s (previously %s)",
+            target,
+            match.similarity,
+            similarity,
+        )
+        self._last_match = match
+        self._remember_match(target, match)
+        return [match]
+
+    def _atlas_key(self, target: Target) -> str | None:
+        filename = getattr(target, "filename", None)
+        if not filename or not os.path.exists(filename):
+            # only targets with file data can be identified across runs
+            return None
+        atlas = LocationAtlas.from_file(GlobalConfig.location_atlas)
+        screen_size = (self.dc_backend.width, self.dc_backend.height)
+        region = (self.x, self.y, self.width, self.height)
+        return atlas.key(filename, screen_size, region)
+
+    def _remember_match(self, target: Target, match: "Match") -> None:
+        box = (match.x, match.y, match.width, match.height)
+        self._last_locations[self._target_key(target)] = box
+        if GlobalConfig.location_atlas != "":
+            key = self._atlas_key(target)
+            if key is not None:
+                atlas = LocationAtlas.from_file(GlobalConfig.location_atlas)
+                atlas.update(key, box, match.similarity)
+
+    def _target_key(self, target: Target) -> str:
+        filename = getattr(target, "filename", None)
+        return filename if filename else str(target)
+
+    def _fingerprint(self, screen_capture: Image) -> tuple[int, int, int]:
+        import zlib
+        import numpy
+
+        data = numpy.ascontiguousarray(screen_capture.numpy_array)
+        return screen_capture.width, screen_capture.height, zlib.crc32(data)
 
     def _target_from_string(self, target_str: str) -> Target:
         # handle some specific target types
@@ -598,6 +855,22 @@ class Region(object):
         log.info("Waiting for %s", target)
         return self.find(target, timeout)
 
+    def wait_any(
+        self, targets: list[str | Target], timeout: int = 30, workers: int = 1
+    ) -> "list[list[Match]]":
+        """
+        Wait for any of multiple targets to appear with a given timeout as failing tolerance.
+
+        :param targets: targets to look for
+        :param timeout: timeout before giving up
+        :param workers: number of targets matched concurrently
+        :returns: matches obtained from finding each of the targets within
+                  the region in the same order (empty for missing targets)
+        :raises: :py:class:`errors.FindError` if none of the targets is found
+        """
+        log.info("Waiting for any of %s", ", ".join(map(str, targets)))
+        return self.find_any(targets, timeout, workers)
+
     def _unfind(self, target: str | Target, timeout: int = 30) -> "Region":
         """
         Emulate waiting for a vanishing target.
@@ -612,13 +885,33 @@ class Region(object):
         as `wait_vanish()` just like `find()` is not meant to be used on the same
         level of abstraction as `wait()`.
         """
+        return self._run_polls(self._unfind_polls(target, timeout))
+
+    def _unfind_polls(
+        self, target: str | Target, timeout: int = 30
+    ) -> "Generator[float, None, Region]":
+        if isinstance(target, str):
+            target = self._target_from_string(target)
+        log.debug("Looking for vanishing target %s", target)
+        cv_backend = self._determine_cv_backend(target)
+
+        last_fingerprint = None
         expires = time.time() + timeout
         while time.time() < expires:
-            if self.exists(target, 0) is None:
-                return self
+            screen_capture = self.dc_backend.capture_screen(self)
+
+            # matching the same screen again would only yield the same matches
+            fingerprint = self._fingerprint(screen_capture)
+            if fingerprint != last_fingerprint:
+                if len(cv_backend.find(target, screen_capture)) == 0:
+                    log.info("%s is not present", target)
+                    return self
+                last_fingerprint = fingerprint
+            else:
+                log.debug("Screen unchanged, target is still present")
 
-            # don't hog the CPU (as rescan within find will check the inverse)
-            time.sleep(GlobalConfig.rescan_speed_on_find)
+            # don't hog the CPU
+            yield GlobalConfig.rescan_speed_on_find
 
         # target is still there
         raise NotFindError(target)
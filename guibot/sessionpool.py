@@ -0,0 +1,151 @@
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pool of guibot sessions running the same scripts on multiple screens.
+
+SUMMARY
+------------------------------------------------------
+
+A session pool owns one guibot object per display controller (e.g. one VNC
+controller per virtual machine) and runs scripts on all of its sessions using
+a bounded number of worker threads. Each session has its own CV backend while
+read-only resources like cached needle images, loaded text detection and deep
+learning models, and parsed match files are shared among all sessions.
+
+INTERFACE
+------------------------------------------------------
+
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from .guibot import GuiBot
+from .finder import Finder
+from .controller import Controller
+
+log = logging.getLogger("guibot.sessionpool")
+__all__ = ["SessionPool"]
+
+
+class SessionPool(object):
+    """
+    Pool of guibot sessions for a set of display controllers.
+
+    Scripts are callables taking a session (guibot object) as their only
+    argument and are never run concurrently within the same session.
+    """
+
+    def __init__(
+        self, controllers: list[Controller], cv: Finder = None, workers: int = None
+    ) -> None:
+        """
+        Build a pool of sessions, one for each display controller.
+
+        :param controllers: DC backends for all sessions
+        :param cv: CV backend copied for each session or None for the default one
+        :param workers: maximal number of concurrently running sessions or None
+                        for as many workers as sessions
+        """
+        self.sessions = []
+        for dc in controllers:
+            session_cv = None if cv is None else cv.copy()
+            self.sessions.append(GuiBot(dc=dc, cv=session_cv))
+        self.workers = len(self.sessions) if workers is None else workers
+
+        self._runs = [0] * len(self.sessions)
+        self._failures = [0] * len(self.sessions)
+        self._busy_time = [0.0] * len(self.sessions)
+
+    def add_path(self, directory: str) -> None:
+        """
+        Add a path to the list of currently accessible paths of all sessions.
+
+        :param directory: path to add
+        """
+        # the file resolver paths are shared among all sessions
+        if len(self.sessions) > 0:
+            self.sessions[0].add_path(directory)
+
+    def get_stats(self) -> list[dict[str, float]]:
+        """
+        Getter for readonly attribute.
+
+        :returns: number of script runs, failed runs, busy time in seconds,
+                  and throughput in runs per second for each session
+        """
+        stats = []
+        for i in range(len(self.sessions)):
+            busy_time = self._busy_time[i]
+            stats.append(
+                {
+                    "runs": self._runs[i],
+                    "failures": self._failures[i],
+                    "busy_time": busy_time,
+                    "throughput": self._runs[i] / busy_time if busy_time > 0 else 0.0,
+                }
+            )
+        return stats
+
+    stats = property(fget=get_stats)
+
+    def run(self, script: Callable[[GuiBot], Any], repeat: int = 1) -> list[Any]:
+        """
+        Run a script on all sessions with a bounded number of workers.
+
+        :param script: callable to run with each session as its argument
+        :param repeat: number of consecutive script runs within each session
+        :returns: result of the last script run for each session or the
+                  exception raised by it if it failed
+
+        Failures within one session are logged and do not interrupt the
+        remaining sessions.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(self._run_session, i, script, repeat)
+                for i in range(len(self.sessions))
+            ]
+            results = [future.result() for future in futures]
+
+        for i, stats in enumerate(self.stats):
+            log.info(
+                "Session %s: %s runs (%s failed) at %.2f runs per second",
+                i,
+                stats["runs"],
+                stats["failures"],
+                stats["throughput"],
+            )
+        return results
+
+    def _run_session(
+        self, index: int, script: Callable[[GuiBot], Any], repeat: int
+    ) -> Any:
+        session = self.sessions[index]
+        result = None
+        for _ in range(repeat):
+            start_time = time.time()
+            try:
+                result = script(session)
+            except Exception as error:
+                log.error("Session %s failed: %s", index, error)
+                self._failures[index] += 1
+                result = error
+            self._busy_time[index] += time.time() - start_time
+            self._runs[index] += 1
+        return result
@@ -28,8 +28,9 @@ INTERFACE
 import copy
 import os
 import re
+import logging
 import PIL.Image
-from typing import Iterator
+from typing import Any, Callable, Iterator
 
 from .config import GlobalConfig
 from .location import Location
@@ -37,6 +38,7 @@ from .fileresolver import FileResolver
 from .finder import *
 from .errors import *
 
+log = logging.getLogger("guibot.target")
 __all__ = ["Target", "Image", "Text", "Pattern", "Chain"]
 
 
@@ -234,6 +236,8 @@ class Image(Target):
     """Container for image data supporting caching, clicking target, file operations, and preprocessing."""
 
     _cache = {}
+    # derived representations of cached image data for each filename
+    _derived_cache = {}
 
     def __init__(
         self,
@@ -241,6 +245,7 @@ class Image(Target):
         pil_image: PIL.Image.Image = None,
         match_settings: "Finder" = None,
         use_cache: bool = True,
+        numpy_array: "Matlike" = None,
     ) -> None:
         """
         Build an image object.
@@ -249,10 +254,17 @@ class Image(Target):
         :param pil_image: image data - use cache or recreate if none
         :param match_settings: predefined configuration for the CV backend if any
         :param use_cache: whether to cache image data for better performance
+        :param numpy_array: image data as a contiguous RGB array to wrap directly
+                            without any conversion (e.g. from a screen capture)
+                            through a read-only view, so the array itself stays
+                            writeable but must not be modified while the image
+                            is in use since the image caches data derived from it
         """
         super(Image, self).__init__(match_settings)
         self._filename = image_filename
         self._pil_image: PIL.Image.Image = None
+        self._numpy_array: "Matlike" = None
+        self._derived: dict[tuple[str, tuple[Any, ...]], Any] = {}
         self._width = 0
         self._height = 0
 
@@ -261,6 +273,16 @@ class Image(Target):
         # per instance pil image has the final word
         if pil_image is not None:
             self._pil_image = pil_image
+            self._numpy_array = None
+            self._derived = {}
+        elif numpy_array is not None:
+            # the array is shared so protect it from accidental modification
+            # through the image without changing the flags of the caller's array
+            numpy_array = numpy_array.view()
+            numpy_array.flags.writeable = False
+            self._pil_image = None
+            self._numpy_array = numpy_array
+            self._derived = {}
         # per instance match settings have the final word
         if match_settings is not None:
             self.match_settings = match_settings
@@ -269,6 +291,9 @@ class Image(Target):
         if self._pil_image:
             self._width = self._pil_image.size[0]
             self._height = self._pil_image.size[1]
+        elif self._numpy_array is not None:
+            self._width = self._numpy_array.shape[1]
+            self._height = self._numpy_array.shape[0]
 
     def __str__(self) -> str:
         """Provide the image filename."""
@@ -313,11 +338,80 @@ class Image(Target):
         Getter for readonly attribute.
 
         :returns: image data of the image
+
+        The PIL image is created only once on demand if the image
+        wraps array data.
         """
+        if self._pil_image is None and self._numpy_array is not None:
+            self._pil_image = PIL.Image.fromarray(self._numpy_array)
         return self._pil_image
 
     pil_image = property(fget=get_pil_image)
 
+    def get_numpy_array(self) -> "Matlike":
+        """
+        Getter for readonly attribute.
+
+        :returns: image data of the image as a readonly RGB array
+
+        The array is created only once on demand and shared among all
+        consumers so a copy should be made before any modification.
+        """
+        if self._numpy_array is None and self._pil_image is not None:
+            import numpy
+
+            self._numpy_array = numpy.array(self._pil_image)
+            self._numpy_array.flags.writeable = False
+        return self._numpy_array
+
+    numpy_array = property(fget=get_numpy_array)
+
+    def get_gray_array(self) -> "Matlike":
+        """
+        Getter for readonly attribute.
+
+        :returns: image data of the image as a readonly grayscale array
+
+        The array is created only once on demand and shared among all
+        consumers so a copy should be made before any modification.
+        """
+        if self.numpy_array is None:
+            return None
+
+        def compute() -> "Matlike":
+            import cv2
+
+            gray_array = cv2.cvtColor(self.numpy_array, cv2.COLOR_RGB2GRAY)
+            gray_array.flags.writeable = False
+            return gray_array
+
+        return self.derive("gray", (), compute)
+
+    gray_array = property(fget=get_gray_array)
+
+    def derive(
+        self, operation: str, params: tuple[Any, ...], compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Obtain a representation derived from the image data computing it only once.
+
+        :param operation: name of the operation deriving the representation
+        :param params: hashable parameters of the operation
+        :param compute: callable computing the representation if not yet cached
+        :returns: derived representation shared among all consumers
+
+        The cached representations are dropped whenever the image data changes
+        and are shared among all images loaded from the same cached file so the
+        returned data should be copied before any modification.
+        """
+        key = (operation, params)
+        derived = self._derived.get(key, None)
+        if derived is None:
+            log.log(9, "Deriving %s%s representation of %s", operation, params, self)
+            derived = compute()
+            self._derived[key] = derived
+        return derived
+
     def load(
         self, filename: str, use_cache: bool = True, **kwargs: dict[str, type]
     ) -> None:
@@ -331,15 +425,20 @@ class Image(Target):
         if not os.path.exists(filename):
             filename = FileResolver().search(filename)
 
+        # any array views belong to the previous image data
+        self._numpy_array = None
         # TODO: check if mtime of the file changed -> cache dirty?
         if use_cache and filename in self._cache:
             self._pil_image = self._cache[filename]
+            self._derived = self._derived_cache.setdefault(filename, {})
         else:
             # load and cache image
             with PIL.Image.open(filename) as pil_image:
                 self._pil_image = pil_image.convert("RGB")
+            self._derived = {}
             if use_cache:
                 self._cache[filename] = self._pil_image
+                self._derived_cache[filename] = self._derived
         self._filename = filename
 
     def save(self, filename: str) -> "Image":
@@ -519,7 +618,10 @@ class Chain(Target):
         """
         super(Chain, self).__init__(match_settings)
         self.target_name = target_name
+        self.filename = None
         self._steps = []
+        # match configuration files of the steps in the same order
+        self.step_configs: list[str] = []
         self.load(self.target_name)
 
     def __str__(self) -> str:
@@ -557,6 +659,7 @@ class Chain(Target):
         # make sure we have the correct file
         steps_filename = resolve_stepsfile(steps_filename)
         stepsfiles_seen = [steps_filename]
+        self.filename = steps_filename
 
         with open(steps_filename) as f:
             lines = f.readlines()
@@ -603,6 +706,7 @@ class Chain(Target):
                 )
 
             self._steps.append(data_and_config)
+            self.step_configs.append(config)
 
         # now define own match configuration
         super(Chain, self).load(steps_filename)
@@ -50,6 +50,8 @@ else
 fi
 pip3 install vncdotool==0.12.0
 apt-get -y install xdotool x11-apps imagemagick
+# in-memory X11 screen capture, XTest input, and capture providers
+pip3 install python-xlib==0.33 mss==10.0.0
 # NOTE: Must install tkinter here to use MouseInfo
 apt-get -y install python3-tk
 apt-get -y install gnome-screenshot
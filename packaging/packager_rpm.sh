@@ -36,6 +36,8 @@ else
 fi
 pip3 install vncdotool==0.12.0
 dnf -y install xdotool xwd ImageMagick
+# in-memory X11 screen capture, XTest input, and capture providers
+pip3 install python-xlib==0.33 mss==10.0.0
 # NOTE: No need for installing tkinter here because it's a dependency from torch (it is installed with it)
 dnf -y install gnome-screenshot
 pip3 install pyautogui==0.9.54
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import common_test
+from guibot.atlas import LocationAtlas
+
+
+class LocationAtlasTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.atlas_file = os.path.join(self.tmpdir, "atlas.json")
+        self.target_file = os.path.join(self.tmpdir, "target.png")
+        shutil.copy(os.path.join(common_test.unittest_dir, 'images', 'shape_blue_circle.png'),
+                    self.target_file)
+
+    def tearDown(self) -> None:
+        LocationAtlas._atlases.clear()
+        shutil.rmtree(self.tmpdir)
+
+    def test_persistence(self) -> None:
+        """Test that stored locations are available after reloading the atlas."""
+        atlas = LocationAtlas.from_file(self.atlas_file)
+        self.assertIs(LocationAtlas.from_file(self.atlas_file), atlas)
+        key = atlas.key(self.target_file, (1024, 768), (0, 0, 1024, 768))
+        self.assertIsNone(atlas.lookup(key))
+
+        atlas.update(key, (104, 10, 165, 151), 0.99)
+        self.assertEqual(atlas.lookup(key), ((104, 10, 165, 151), 0.99))
+        self.assertTrue(os.path.exists(self.atlas_file))
+
+        reloaded = LocationAtlas(self.atlas_file)
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(reloaded.key(self.target_file, (1024, 768), (0, 0, 1024, 768)), key)
+        self.assertEqual(reloaded.lookup(key), ((104, 10, 165, 151), 0.99))
+
+    def test_corrupted(self) -> None:
+        """Test that a corrupted atlas file is replaced by an empty atlas."""
+        with open(self.atlas_file, "w") as f:
+            f.write('{"key": {"box": [104, 10')
+        atlas = LocationAtlas.from_file(self.atlas_file)
+        self.assertEqual(len(atlas), 0)
+
+        key = atlas.key(self.target_file, (1024, 768), (0, 0, 1024, 768))
+        atlas.update(key, (104, 10, 165, 151), 0.99)
+        self.assertEqual(LocationAtlas(self.atlas_file).lookup(key), ((104, 10, 165, 151), 0.99))
+        # no temporary files of the atomic writes are left behind
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ["atlas.json", "target.png"])
+
+    def test_key(self) -> None:
+        """Test that locations depend on the target data, screen size, and region."""
+        atlas = LocationAtlas(self.atlas_file)
+        key = atlas.key(self.target_file, (1024, 768), (0, 0, 1024, 768))
+        self.assertNotEqual(atlas.key(self.target_file, (1920, 1080), (0, 0, 1024, 768)), key)
+        self.assertNotEqual(atlas.key(self.target_file, (1024, 768), (0, 0, 500, 500)), key)
+
+        # the same file name with different content is a different target
+        with open(self.target_file, "ab") as f:
+            f.write(b"\0")
+        os.utime(self.target_file, (0, 0))
+        self.assertNotEqual(atlas.key(self.target_file, (1024, 768), (0, 0, 1024, 768)), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
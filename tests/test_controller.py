@@ -22,10 +22,12 @@ import shutil
 import unittest
 import subprocess
 from typing import Any
+from unittest.mock import patch, PropertyMock
 
 import common_test
 from guibot.errors import *
 from guibot.controller import *
+from guibot.capture import X11CaptureProvider
 from guibot.region import Region
 from guibot.location import Location
 from guibot.config import GlobalConfig
@@ -122,6 +124,10 @@ class ControllerTest(unittest.TestCase):
             self.backends += [AutoPyController()]
         if os.environ.get('DISABLE_XDOTOOL', "0") == "0":
             self.backends += [XDoToolController()]
+            xtest = XDoToolController(synchronize=False)
+            xtest.params["xdotool"]["input"] = "xtest"
+            xtest.synchronize_backend()
+            self.backends += [xtest]
         if os.environ.get('DISABLE_PYAUTOGUI', "0") == "0":
             self.backends += [PyAutoGUIController()]
         if os.environ.get('DISABLE_VNCDOTOOL', "0") == "0":
@@ -243,6 +249,250 @@ class ControllerTest(unittest.TestCase):
             self.assertEqual(320, captured.width)
             self.assertEqual(200, captured.height)
 
+    @unittest.skipIf(os.environ.get('DISABLE_VNCDOTOOL', "0") == "1", "VNCDoTool disabled")
+    def test_capture_vncdotool_incremental(self) -> None:
+        """Check the incremental and full region screendumps of the vncdotool backend match."""
+        display = [b for b in self.backends if isinstance(b, VNCDoToolController)][0]
+        region = Region(10, 10, 320, 200)
+        display.params["vncdotool"]["incremental"] = False
+        full_captured = display.capture_screen(region)
+        full_bytes = display.capture_bytes
+        display.params["vncdotool"]["incremental"] = True
+        # unchanged screen region should be reused from the local framebuffer
+        # after the update timeout without being requested in full again
+        incremental_captured = display.capture_screen(region)
+        self.assertLess(display.capture_bytes, full_bytes)
+        # a subregion of a fetched region is up to date too and a still pending
+        # incremental request should not be followed by another request
+        display.capture_screen(Region(20, 20, 100, 100))
+        self.assertLess(display.capture_bytes, full_bytes)
+
+        self.assertEqual(full_captured.width, incremental_captured.width)
+        self.assertEqual(full_captured.height, incremental_captured.height)
+        self.assertEqual(list(full_captured.pil_image.getdata()),
+                         list(incremental_captured.pil_image.getdata()))
+
+    @unittest.skipIf(os.environ.get('DISABLE_VNCDOTOOL', "0") == "1", "VNCDoTool disabled")
+    def test_capture_vncdotool_timeout(self) -> None:
+        """Check the vncdotool backend does not return frames without a timely update."""
+        display = [b for b in self.backends if isinstance(b, VNCDoToolController)][0]
+        region = Region(10, 10, 320, 200)
+        display.params["vncdotool"]["refresh_timeout"] = 0.0
+        for incremental in [False, True]:
+            display.params["vncdotool"]["incremental"] = incremental
+            display.params["vncdotool"]["update_timeout"] = 0.0
+            self.assertRaises(TimeoutError, display.capture_screen, region)
+
+    @unittest.skipIf(os.environ.get('DISABLE_VNCDOTOOL', "0") == "1", "VNCDoTool disabled")
+    def test_capture_vncdotool_encodings(self) -> None:
+        """Check screendumps of the vncdotool backend with custom encodings and pixel format."""
+        display = [b for b in self.backends if isinstance(b, VNCDoToolController)][0]
+        region = Region(10, 10, 320, 200)
+        display.params["vncdotool"]["incremental"] = False
+        display.capture_screen(region)
+        default_bytes = display.capture_bytes
+        self.assertGreater(default_bytes, 0)
+
+        display.params["vncdotool"]["vnc_encodings"] = ["zrle", "raw"]
+        display.params["vncdotool"]["vnc_pixel_format"] = "rgb16"
+        display.synchronize_backend()
+        display.params["vncdotool"]["incremental"] = False
+        captured = display.capture_screen(region)
+        self.assertEqual(320, captured.width)
+        self.assertEqual(200, captured.height)
+        self.assertGreater(display.capture_bytes, 0)
+        self.assertLess(display.capture_bytes, default_bytes)
+
+        display.params["vncdotool"]["vnc_encodings"] = ["tight"]
+        self.assertRaises(ValueError, display.synchronize_backend)
+
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_capture_xdotool_fallback(self) -> None:
+        """Check the in-memory and subprocess screendumps of the xdotool backend match."""
+        display = XDoToolController(synchronize=False)
+        display.params["xdotool"]["capture"] = "xwd"
+        display.synchronize_backend()
+        self.assertIsNone(display._xdisplay)
+        region = Region(10, 10, 320, 200)
+        xwd_captured = display.capture_screen(region)
+
+        display.params["xdotool"]["capture"] = "xlib"
+        display.synchronize_backend()
+        self.assertIsNotNone(display._xdisplay)
+        xlib_captured = display.capture_screen(region)
+
+        self.assertEqual(xwd_captured.width, xlib_captured.width)
+        self.assertEqual(xwd_captured.height, xlib_captured.height)
+        self.assertEqual(xwd_captured.pil_image.mode, xlib_captured.pil_image.mode)
+
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_capture_xdotool_pixel_format(self) -> None:
+        """Check the xdotool backend falls back to xwd for unsupported pixel formats."""
+        display = XDoToolController(synchronize=False)
+        display.params["xdotool"]["capture"] = "xlib"
+        display.params["control"]["capture_backend"] = "x11"
+        with patch.object(X11CaptureProvider, "direct_grab",
+                          new_callable=PropertyMock, return_value=False):
+            display.synchronize_backend()
+        self.assertIsNotNone(display._xconnection)
+        self.assertIsNone(display._xdisplay)
+        self.assertIsNone(display._capture_obj)
+
+        captured = display.capture_screen(Region(10, 10, 320, 200))
+        self.assertEqual(320, captured.width)
+        self.assertEqual(200, captured.height)
+
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_xtest_xdotool_fallback(self) -> None:
+        """Check the xtest input delegates only commands it cannot emulate to xdotool."""
+        display = XDoToolController(synchronize=False)
+        display.params["xdotool"]["input"] = "xtest"
+        display.synchronize_backend()
+        self.assertIn("xdotool version", display._backend_obj.run("version"))
+
+        # emulated commands never need the xdotool client
+        display.params["xdotool"]["binary"] = "xdotool-missing"
+        self.assertIn("x:", display._backend_obj.run("getmouselocation"))
+        self.assertRaises(OSError, display._backend_obj.run, "version")
+
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_xdotool_shared_connection(self) -> None:
+        """Check the xdotool backend uses a single X connection for all purposes."""
+        display = XDoToolController(synchronize=False)
+        display.params["xdotool"]["input"] = "xtest"
+        display.params["control"]["capture_backend"] = "x11"
+        display.synchronize_backend()
+        self.assertIs(display._xdisplay, display._xconnection)
+        self.assertIs(display._xpointer, display._xconnection)
+        connection = display._xconnection.display
+        self.assertIs(display._backend_obj.display, connection)
+        self.assertIs(display._capture_obj.display, connection)
+
+    def test_capture_providers(self) -> None:
+        """Check screendump capabilities of all capture providers for all backends."""
+        providers = []
+        if platform.system() == 'Linux':
+            providers += ["x11"]
+        providers += ["mss"]
+        for display in self.backends:
+            # the VNC controller has additional setup in these tests
+            if isinstance(display, VNCDoToolController):
+                continue
+            for provider in providers:
+                display.params["control"]["capture_backend"] = provider
+                display.synchronize_backend()
+                self.assertIsNotNone(display._capture_obj)
+
+                region = Region(10, 10, 320, 200)
+                captured = display.capture_screen(region)
+                self.assertEqual(320, captured.width)
+                self.assertEqual(200, captured.height)
+                self.assertGreater(display.capture_latency, 0.0)
+                self.assertGreater(display._capture_obj.mean_latency, 0.0)
+
+            display.params["control"]["capture_backend"] = "default"
+            display.synchronize_backend()
+            self.assertIsNone(display._capture_obj)
+
+    def test_capture_frame_cache(self) -> None:
+        """Check screendump frame caching for all display controller backends."""
+        for display in self.backends:
+            display.params["control"]["frame_cache_age"] = 10.0
+            display.clear_frame_cache()
+
+            frame = display.capture_screen()
+            self.assertIs(frame, display.capture_screen())
+            captured = display.capture_screen(Region(10, 10, 320, 200))
+            self.assertEqual(320, captured.width)
+            self.assertEqual(200, captured.height)
+            self.assertEqual(captured.pil_image.getpixel((0, 0)),
+                             frame.pil_image.getpixel((10, 10)))
+
+            # input actions invalidate the cached frame
+            display.mouse_move(Location(30, 20), smooth=False)
+            self.assertIsNot(frame, display.capture_screen())
+
+            display.params["control"]["frame_cache_age"] = 0.0
+            self.assertIsNot(display.capture_screen(), display.capture_screen())
+
+    def test_capture_background(self) -> None:
+        """Check background screendump capabilities for all display controller backends."""
+        for display in self.backends:
+            display.params["control"]["capture_fps"] = 20.0
+            display.params["control"]["capture_buffer_size"] = 2
+            display.start_background_capture()
+            try:
+                time.sleep(1)
+                frames = display.frames
+                self.assertEqual(len(frames), 2)
+                self.assertLess(frames[0][0], frames[1][0])
+                captured = display.capture_screen(Region(10, 10, 320, 200))
+                self.assertEqual(320, captured.width)
+                self.assertEqual(200, captured.height)
+
+                # input actions drop all outdated frames
+                display.mouse_move(Location(30, 20), smooth=False)
+                captured = display.capture_screen()
+                self.assertEqual(display.width, captured.width)
+                self.assertEqual(display.height, captured.height)
+                self.assertGreaterEqual(len(display.frames), 1)
+            finally:
+                display.stop_background_capture()
+            self.assertEqual(len(display.frames), 0)
+
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_capture_background_xtest(self) -> None:
+        """Check background screendumps of the xdotool backend during xtest input actions."""
+        display = XDoToolController(synchronize=False)
+        display.params["xdotool"]["input"] = "xtest"
+        display.params["xdotool"]["capture"] = "xlib"
+        display.params["xdotool"]["pointer_confirm"] = True
+        display.synchronize_backend()
+        # the same X display connection is used for capture, input, and pointer
+        self.assertIs(display._xdisplay, display._xconnection)
+        self.assertIs(display._xpointer, display._xconnection)
+
+        display.params["control"]["capture_fps"] = 100.0
+        display.start_background_capture()
+        try:
+            for i in range(20):
+                location = Location(30 + i, 20 + i)
+                display.mouse_move(location, smooth=False)
+                self.assertEqual(display.mouse_location.x, location.x)
+                self.assertEqual(display.mouse_location.y, location.y)
+                display.keys_toggle(["a"], True)
+                display.keys_toggle(["a"], False)
+                captured = display.capture_screen(Region(10, 10, 320, 200))
+                self.assertEqual(320, captured.width)
+                self.assertEqual(200, captured.height)
+            # the background capture should not have failed in the meantime
+            self.assertIsNotNone(display._capture_thread)
+            self.assertGreater(len(display.frames), 0)
+        finally:
+            display.stop_background_capture()
+
+    def test_capture_background_failure(self) -> None:
+        """Check screendumps are captured anew after a failure of the background capture."""
+        for display in self.backends:
+            display.params["control"]["capture_fps"] = 20.0
+            display.start_background_capture()
+            try:
+                time.sleep(0.5)
+                self.assertGreater(len(display.frames), 0)
+                with patch.object(display, "_capture_fresh", side_effect=OSError("failed")):
+                    time.sleep(0.5)
+                self.assertIsNone(display._capture_thread)
+                self.assertEqual(len(display.frames), 0)
+
+                with patch.object(display, "_capture_fresh",
+                                  wraps=display._capture_fresh) as capture:
+                    captured = display.capture_screen()
+                capture.assert_called_once()
+                self.assertEqual(display.width, captured.width)
+                self.assertEqual(display.height, captured.height)
+            finally:
+                display.stop_background_capture()
+
     def test_capture_clipping(self) -> None:
         """Check screendump clipping for all display controller backends."""
         for display in self.backends:
@@ -276,6 +526,20 @@ class ControllerTest(unittest.TestCase):
                 self.assertAlmostEqual(location.x, 30, delta=1)
                 self.assertAlmostEqual(location.y, 20, delta=1)
 
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_mouse_move_xdotool_confirm(self) -> None:
+        """Check mouse moves of the xdotool backend with and without pointer confirmation."""
+        display = XDoToolController(synchronize=False)
+        for confirm in [False, True]:
+            display.params["xdotool"]["pointer_confirm"] = confirm
+            display.synchronize_backend()
+            self.assertEqual(display._xpointer is not None, confirm)
+            for x, y in [(0, 0), (30, 20)]:
+                display.mouse_move(Location(x, y), smooth=False)
+                location = display.mouse_location
+                self.assertEqual(location.x, x)
+                self.assertEqual(location.y, y)
+
     @unittest.skipIf(os.environ.get('DISABLE_PYQT', "0") == "1", "PyQt disabled")
     @retry_on_failure(max_attempts=5)
     def test_mouse_click(self) -> None:
@@ -316,6 +580,25 @@ class ControllerTest(unittest.TestCase):
 
                         self._verify_dumps("mouse")
 
+    @unittest.skipIf(os.environ.get('DISABLE_XDOTOOL', "0") == "1", "XDoTool disabled")
+    def test_mouse_click_xdotool_script(self) -> None:
+        """Check composite xdotool actions are chained into a single invocation."""
+        display = XDoToolController()
+        display.mouse_move(Location(0, 0), smooth=False)
+        with patch("subprocess.check_output", wraps=subprocess.check_output) as check_output:
+            display.mouse_click(display.mousemap.LEFT_BUTTON, count=2,
+                                modifiers=[display.keymap.CTRL, display.keymap.SHIFT])
+            self.assertEqual(check_output.call_count, 1)
+            process = check_output.call_args[0][0]
+            self.assertEqual(process.count("mousedown"), 2)
+            self.assertEqual(process.count("keydown"), 2)
+            self.assertEqual(process.count("keyup"), 2)
+            self.assertIn("sleep", process)
+
+            check_output.reset_mock()
+            display.keys_press([display.keymap.CTRL, display.keymap.SHIFT])
+            self.assertEqual(check_output.call_count, 1)
+
     @unittest.skipIf(os.environ.get('DISABLE_PYQT', "0") == "1", "PyQt disabled")
     def test_mouse_updown(self) -> None:
         """Check mouse up/down effect for all display controller backends."""
@@ -17,6 +17,7 @@
 import os
 import re
 import unittest
+import unittest.mock
 import shutil
 import ssl
 
@@ -25,6 +26,7 @@ from guibot.config import GlobalConfig
 from guibot.fileresolver import FileResolver
 from guibot.imagelogger import ImageLogger
 from guibot.target import Image, Text, Pattern, Chain
+from guibot.match import Match
 from guibot.errors import *
 from guibot.finder import *
 
@@ -65,6 +67,8 @@ class FinderTest(unittest.TestCase):
         ImageLogger.accumulate_logging = False
 
     def tearDown(self) -> None:
+        # some tests change the logging level
+        GlobalConfig.image_logging_level = 0
         if os.path.exists(GlobalConfig.image_logging_destination):
             shutil.rmtree(GlobalConfig.image_logging_destination)
 
@@ -332,8 +336,8 @@ class FinderTest(unittest.TestCase):
         i = 1
 
         for template in finder.algorithms["template_matchers"]:
-            # one of the backend is too tolerant for this case
-            if template == "ccorr_normed":
+            # one of the backends (also with pyramids) is too tolerant for this case
+            if template in ["ccorr_normed", "pyramid_ccorr_normed"]:
                 continue
             finder.configure_backend(template, "template")
             matches = finder.find(Image('n_ibs'), Image('all_shapes'))
@@ -377,6 +381,193 @@ class FinderTest(unittest.TestCase):
             self.assertEqual(matches[0].width, 165)
             self.assertEqual(matches[0].height, 151)
 
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_many(self) -> None:
+        """Test for updated settings of multiple needles matched concurrently."""
+        # concurrently matched needles would share the same logging step
+        GlobalConfig.image_logging_level = 40
+        finder = TemplateFinder()
+        finder.params["find"]["similarity"].value = 0.75
+        needles = [Image('shape_red_box'), Image('shape_green_box'),
+                   Image('shape_blue_circle')]
+        haystack = Image('all_shapes')
+
+        all_matches = finder.find_many(needles, haystack, workers=3)
+        self.assertEqual(len(all_matches), 3)
+        for needle, matches in zip(needles, all_matches):
+            self.assertGreater(len(matches), 0)
+            # no needle should keep the finder copy that matched it
+            self.assertIs(needle.match_settings, finder)
+
+        finder.params["find"]["similarity"].value = 0.99
+        for needle in needles:
+            self.assertEqual(needle.match_settings.params["find"]["similarity"].value, 0.99)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_tiles(self) -> None:
+        """Test for identical multiple matches in haystack tiles for all template CV backends."""
+        finder = TemplateFinder()
+        finder.params["find"]["similarity"].value = 0.8
+        full_finder = TemplateFinder()
+        full_finder.params["find"]["similarity"].value = 0.8
+
+        for template in finder.algorithms["template_matchers"]:
+            full_finder.configure_backend(template, "template")
+            expected = full_finder.find(Image('shape_red_box'), Image('all_shapes'))
+            expected = sorted((match.x, match.y) for match in expected)
+            for tiles in [2, 3]:
+                finder.configure_backend(template, "template")
+                finder.params["template"]["tiles"].value = tiles
+                matches = finder.find(Image('shape_red_box'), Image('all_shapes'))
+                self.assertEqual(sorted((match.x, match.y) for match in matches), expected)
+                for match in matches:
+                    self.assertEqual(match.width, 68)
+                    self.assertEqual(match.height, 56)
+
+                # the finder copies for the tiles are reused among finds
+                copies = finder._pools["tiles"][1]
+                self.assertEqual(len(copies), tiles * tiles)
+                finder.find(Image('shape_red_box'), Image('all_shapes'))
+                for copy, reused_copy in zip(copies, finder._pools["tiles"][1]):
+                    self.assertIs(copy, reused_copy)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_scales(self) -> None:
+        """Test for successful match of scaled images for some template CV backends."""
+        finder = TemplateFinder()
+        finder.params["find"]["similarity"].value = 0.9
+        needle = Image('shape_blue_circle')
+        haystack = Image('all_shapes')
+        scaled_size = (int(haystack.width * 1.5), int(haystack.height * 1.5))
+        haystack = Image(pil_image=haystack.pil_image.resize(scaled_size))
+
+        # correlation without mean subtraction is too tolerant to scaling
+        for template in ["ccoeff_normed", "pyramid_ccoeff_normed"]:
+            finder.configure_backend(template, "template")
+            finder.params["template"]["scale_min"].value = 1.0
+            finder.params["template"]["scale_max"].value = 2.0
+            finder.params["template"]["scale_step"].value = 0.5
+            finder._last_scale = None
+            matches = finder.find(needle, haystack)
+
+            # verify match accuracy
+            self.assertEqual(len(matches), 1)
+            self.assertAlmostEqual(matches[0].x, 156, delta=2)
+            self.assertAlmostEqual(matches[0].y, 15, delta=2)
+            self.assertAlmostEqual(matches[0].width, 248, delta=1)
+            self.assertAlmostEqual(matches[0].height, 226, delta=1)
+            # verify the matched scale is remembered and tried first
+            self.assertEqual(finder._last_scale, 1.5)
+            self.assertEqual(finder._needle_scales(), [1.5, 1.0, 2.0])
+            self.assertIn(("scaled", (1.5,)), needle._derived)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_incremental(self) -> None:
+        """Test for approximate incremental matching of changing images for all template CV backends."""
+        import numpy
+        finder = TemplateFinder()
+        finder.params["find"]["similarity"].value = 0.9
+        full_finder = TemplateFinder()
+        full_finder.params["find"]["similarity"].value = 0.9
+        # a needle with a single distinct peak that numerical errors cannot move
+        needle = Image('shape_blue_circle')
+
+        haystack = Image('all_shapes')
+        changed = haystack.numpy_array.copy()
+        changed[250:280, 10:40] = 0
+        changed[5:15, 380:395] = 255
+        changed_haystack = Image("", numpy_array=changed)
+
+        for template in finder.algorithms["template_matchers"]:
+            finder.configure_backend(template, "template")
+            finder.params["template"]["incremental"].value = True
+            full_finder.configure_backend(template, "template")
+            for image in [haystack, changed_haystack, changed_haystack, haystack]:
+                # pyramid matching does not reuse previous results
+                if not template.startswith("pyramid_"):
+                    result = finder._match_template(needle, image, False, template)
+                    expected_result = full_finder._match_template(needle, image, False, template)
+                    # only approximately equal scores due to numerical errors
+                    self.assertLessEqual(numpy.abs(result - expected_result).max(), 1e-3)
+
+                matches = finder.find(needle, image)
+                # one of the backends is too tolerant to have only distinct peaks
+                if template.endswith("ccorr_normed"):
+                    continue
+                expected = full_finder.find(needle, image)
+                self.assertEqual(len(matches), len(expected))
+                for match, expected_match in zip(matches, expected):
+                    self.assertEqual((match.x, match.y), (expected_match.x, expected_match.y))
+                    self.assertAlmostEqual(match.similarity, expected_match.similarity, delta=0.001)
+            if not template.startswith("pyramid_"):
+                self.assertEqual(len(finder._result_cache), 1)
+            finder._result_cache.clear()
+
+        # the cache is bounded by both its entries and their total size
+        finder.configure_backend("ccoeff_normed", "template")
+        finder.params["template"]["incremental"].value = True
+        needles = [Image('shape_blue_circle'), Image('shape_red_box'), Image('shape_green_box')]
+        for needle in needles:
+            finder._match_template(needle, haystack, False, "ccoeff_normed")
+        self.assertEqual(len(finder._result_cache), 3)
+        finder._result_cache_size = 2
+        finder._match_template(needles[0], haystack, False, "ccoeff_normed")
+        self.assertEqual(len(finder._result_cache), 2)
+        finder._result_cache_bytes = haystack.numpy_array.nbytes
+        finder._match_template(needles[1], haystack, False, "ccoeff_normed")
+        self.assertEqual(len(finder._result_cache), 1)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_pyramid(self) -> None:
+        """Test for identical multiple matches of coarse-to-fine and full template CV backends."""
+        finder = TemplateFinder()
+        finder.params["find"]["similarity"].value = 0.8
+        full_finder = TemplateFinder()
+        full_finder.params["find"]["similarity"].value = 0.8
+
+        for template in ["sqdiff_normed", "ccorr_normed", "ccoeff_normed"]:
+            full_finder.configure_backend(template, "template")
+            expected = full_finder.find(Image('shape_red_box'), Image('all_shapes'))
+            for levels in [1, 2, 3]:
+                finder.configure_backend("pyramid_" + template, "template")
+                finder.params["template"]["pyramid_levels"].value = levels
+                matches = finder.find(Image('shape_red_box'), Image('all_shapes'))
+                self.assertEqual(len(matches), len(expected))
+                # matches of equal similarity could be found in any order
+                matches = sorted(matches, key=lambda m: (m.x, m.y))
+                expected = sorted(expected, key=lambda m: (m.x, m.y))
+                for match, expected_match in zip(matches, expected):
+                    self.assertAlmostEqual(match.x, expected_match.x, delta=1)
+                    self.assertAlmostEqual(match.y, expected_match.y, delta=1)
+                    self.assertAlmostEqual(match.similarity, expected_match.similarity, delta=0.001)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_peaks(self) -> None:
+        """Test for identical iterative and vectorized peak extraction for all template CV backends."""
+        import numpy
+        finder = TemplateFinder()
+        needle = Image('shape_red_box')
+        # grid of repeated (and partially overlapping) icons
+        icon = needle.numpy_array
+        grid = numpy.full((icon.shape[0] * 6, icon.shape[1] * 8, 3), 255, dtype=numpy.uint8)
+        for row in range(5):
+            for col in range(7):
+                y, x = row * icon.shape[0] + 3 * col, col * icon.shape[1] + 2 * row
+                grid[y:y + icon.shape[0], x:x + icon.shape[1]] = icon
+        haystacks = [Image('all_shapes'), Image("", numpy_array=grid)]
+
+        for template in finder.algorithms["template_matchers"]:
+            finder.configure_backend(template, "template")
+            for similarity in [0.0, 0.5, 0.8, 0.99]:
+                finder.params["find"]["similarity"].value = similarity
+                for haystack in haystacks:
+                    finder.params["template"]["peaks"].value = "iterative"
+                    expected = finder.find(needle, haystack)
+                    finder.params["template"]["peaks"].value = "vectorized"
+                    matches = finder.find(needle, haystack)
+                    self.assertEqual([(m.x, m.y, m.similarity) for m in matches],
+                                     [(m.x, m.y, m.similarity) for m in expected])
+
     @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
     def test_template_multiple(self) -> None:
         """Test for multiple successful matches of images for default template CV backend."""
@@ -398,6 +589,26 @@ class FinderTest(unittest.TestCase):
             self.assertRegex(hotmap, r".*-\d\.\d+.*")
             self.assertTrue(os.path.isfile(os.path.join(self.logpath, hotmap)))
 
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_template_nolog(self) -> None:
+        """Test for identical multiple matches without any hotmaps if image logging is off."""
+        finder = TemplateFinder()
+        expected = finder.find(Image('shape_red_box'), Image('all_shapes'))
+        shutil.rmtree(self.logpath)
+
+        # any new image logger will reset its logging level from the global one
+        GlobalConfig.image_logging_level = 40
+        with unittest.mock.patch.object(finder.imglog, "log") as imglog:
+            matches = finder.find(Image('shape_red_box'), Image('all_shapes'))
+        imglog.assert_called_once_with(30)
+        self.assertEqual(len(finder.imglog.hotmaps), 0)
+
+        self.assertFalse(os.path.exists(self.logpath))
+        self.assertEqual(len(matches), len(expected))
+        for match, expected_match in zip(matches, expected):
+            self.assertEqual((match.x, match.y), (expected_match.x, expected_match.y))
+            self.assertEqual(match.similarity, expected_match.similarity)
+
     @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
     def test_feature_same(self) -> None:
         """Test for successful match of same images for all feature CV backends."""
@@ -611,6 +822,33 @@ class FinderTest(unittest.TestCase):
         self.assertAlmostEqual(matches[0].width, 250, delta=10)
         self.assertAlmostEqual(matches[0].height, 250, delta=10)
 
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "OpenCV disabled")
+    def test_cascade_tiles(self) -> None:
+        """Test for successful match in haystack tiles for the cascade CV backend."""
+        finder = CascadeFinder()
+        # no similarty parameter is supported - this is a binary match case
+        finder.params["find"]["similarity"].value = 0.0
+        # the overlap of the tiles is the maximal size of a match
+        finder.params["cascade"]["maxWidth"].value = 200
+        finder.params["cascade"]["maxHeight"].value = 200
+
+        for tiles in [2, 3]:
+            finder.params["cascade"]["tiles"].value = tiles
+            matches = finder.find(Pattern('shape_blue_circle.xml'), Image('all_shapes'))
+            # the match found in multiple overlapping tiles is reported once
+            self.assertEqual(len(matches), 1)
+            self.assertAlmostEqual(matches[0].x, 104, delta=10)
+            self.assertAlmostEqual(matches[0].y, 10, delta=5)
+            self.assertAlmostEqual(matches[0].width, 165, delta=10)
+            self.assertAlmostEqual(matches[0].height, 151, delta=10)
+
+            # the finder copies for the tiles are reused among finds
+            copies = finder._pools["tiles"][1]
+            self.assertEqual(len(copies), tiles * tiles)
+            finder.find(Pattern('shape_blue_circle.xml'), Image('all_shapes'))
+            for copy, reused_copy in zip(copies, finder._pools["tiles"][1]):
+                self.assertIs(copy, reused_copy)
+
     @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1" or
                      os.environ.get('DISABLE_OCR', "0") == "1",
                      "Disabled OpenCV or OCR")
@@ -1020,6 +1258,81 @@ class FinderTest(unittest.TestCase):
         # verify dumped files count and names
         dumps = self._verify_and_get_dumps(5+5, multistep=True)
 
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_hybrid_parallel(self) -> None:
+        """Test identical match of concurrently evaluated representations."""
+        finder = HybridFinder()
+        finder.configure_backend("template")
+        finder.synchronize_backend("template")
+        finder.params["find"]["similarity"].value = 1.0
+
+        for workers in [1, 2, 4]:
+            finder.params["hybrid"]["workers"].value = workers
+            matches = finder.find(Chain('circle_fallback'), Image('all_shapes'))
+            self.assertEqual(len(matches), 1)
+            self.assertEqual(matches[0].x, 104)
+            self.assertEqual(matches[0].y, 10)
+
+            # the first successful step wins even if a later one succeeds too
+            chain = Chain('circle_fallback')
+            with unittest.mock.patch.object(chain._steps[2].match_settings, "find",
+                                            return_value=[Match(0, 0, 10, 10)]):
+                matches = finder.find(chain, Image('all_shapes'))
+            self.assertEqual(len(matches), 1)
+            self.assertEqual(matches[0].x, 104)
+            self.assertEqual(matches[0].y, 10)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_hybrid_adaptive(self) -> None:
+        """Test successful match of reordered representations based on step statistics."""
+        finder = HybridFinder()
+        finder.configure_backend("template")
+        finder.synchronize_backend("template")
+        finder.params["find"]["similarity"].value = 1.0
+        chain = Chain('circle_fallback')
+        stats_file = os.path.splitext(chain.filename)[0] + ".stats"
+        self.addCleanup(HybridFinder._stats.clear)
+        self.addCleanup(HybridFinder._stats_unsaved.clear)
+        self.addCleanup(lambda: os.path.exists(stats_file) and os.unlink(stats_file))
+
+        # no statistics are collected for strictly ordered chains
+        finder.find(chain, Image('all_shapes'))
+        self.assertFalse(os.path.exists(stats_file))
+
+        finder.params["hybrid"]["strict_order"].value = False
+        finder.params["hybrid"]["stats_interval"].value = 3
+        for _ in range(3):
+            # statistics are only persisted once for the entire interval
+            self.assertFalse(os.path.exists(stats_file))
+            matches = finder.find(chain, Image('all_shapes'))
+            self.assertEqual(len(matches), 1)
+            self.assertEqual(matches[0].x, 104)
+            self.assertEqual(matches[0].y, 10)
+        # the successful step is tried first after all steps were tried once
+        keys = finder._step_keys(chain)
+        order = finder._adaptive_order(keys, HybridFinder._stats[stats_file])
+        self.assertEqual(order[0], 1)
+
+        # statistics are persisted and reused by other matchers
+        HybridFinder._stats.clear()
+        self.assertTrue(os.path.exists(stats_file))
+        stats = finder._chain_stats(chain)
+        # steps are told apart by position and match configuration as well
+        self.assertEqual(keys[1], "2:shape_blue_circle:simple_template.match")
+        self.assertEqual(stats[keys[1]]["attempts"], 3)
+        self.assertEqual(stats[keys[1]]["hits"], 3)
+        self.assertEqual(stats[keys[0]]["hits"], 0)
+
+        # corrupted statistics fall back to the chain order
+        HybridFinder._stats.clear()
+        with open(stats_file, "w") as f:
+            f.write('{"shape_blue_circle": {"attem')
+        stats = finder._chain_stats(chain)
+        self.assertEqual(stats, {})
+        self.assertEqual(finder._adaptive_order(keys, stats), list(range(len(keys))))
+        matches = finder.find(chain, Image('all_shapes'))
+        self.assertEqual(len(matches), 1)
+
     @unittest.skipIf(os.environ.get('DISABLE_AUTOPY', "0") == "1", "AutoPy disabled")
     @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
     def test_hybrid_multiconfig(self) -> None:
@@ -15,6 +15,7 @@
 # along with guibot.  If not, see <http://www.gnu.org/licenses/>.
 
 import sys
+import asyncio
 import inspect
 from unittest import main, mock, TestCase
 
@@ -106,5 +107,43 @@ class ProxyAPITest(TestCase):
             self.interface._proxify.reset_mock()
 
 
+class AsyncAPITest(TestCase):
+
+    def setUp(self) -> None:
+        from guibot import guibot_async
+        self.interface = guibot_async.AsyncRegion(region=mock.MagicMock())
+        self.region = self.interface.region
+
+    def test_polls(self) -> None:
+        """Test that polling methods consume all polls of the actual object."""
+        def polls(result):
+            yield 0.0
+            yield 0.0
+            return result
+        self.region._find_all_polls.return_value = polls(["match"])
+        self.assertEqual(asyncio.run(self.interface.find("target")), "match")
+        self.region._find_all_polls.assert_called_once_with(
+            "target", 10, allow_zero=False, near_last=True)
+
+        self.region._unfind_polls.return_value = polls(self.region)
+        result = asyncio.run(self.interface.wait_vanish("target", timeout=5))
+        self.assertEqual(result, self.interface)
+        self.region._unfind_polls.assert_called_once_with("target", 5)
+
+    def test_call_delegations(self) -> None:
+        """Test that input calls from the interface to the actual object are valid."""
+        asyncio.run(self.interface.type_text("text", ["mod"]))
+        self.region.type_text.assert_called_once_with("text", ["mod"])
+        asyncio.run(self.interface.press_keys("key"))
+        self.region.press_keys.assert_called_once_with("key")
+
+        from guibot.location import Location
+        location = Location(1, 2)
+        self.assertIsNone(asyncio.run(self.interface.click(location)))
+        self.region.hover.assert_called_once_with(location)
+        self.region.dc_backend.mouse_click.assert_called_once_with(
+            self.region.LEFT_BUTTON, 1, None)
+
+
 if __name__ == '__main__':
     main()
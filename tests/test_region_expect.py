@@ -19,14 +19,18 @@ import platform
 import unittest
 import time
 import shutil
+import threading
+import tempfile
 import subprocess
 from typing import Any
+from unittest.mock import patch
 
 import common_test
 from guibot.config import GlobalConfig, TemporaryConfig
 from guibot.fileresolver import FileResolver
 from guibot.location import Location
 from guibot.region import Region
+from guibot.atlas import LocationAtlas
 from guibot.match import Match
 from guibot.target import Image, Text
 from guibot.inputmap import Key
@@ -407,5 +411,181 @@ class RegionTest(unittest.TestCase):
         self.assertTrue(self.region.wait_vanish('all_shapes', timeout=10))
 
 
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_unchanged_screen(self) -> None:
+        screen = Image('all_shapes')
+        self.region.cv_backend = TemplateFinder()
+        with patch.object(self.region.dc_backend, "capture_screen", return_value=screen), \
+                patch.object(self.region.cv_backend, "find",
+                             wraps=self.region.cv_backend.find) as find:
+            self.assertRaises(FindError, self.region.find, Image('n_ibs'), timeout=1)
+            # the same screen is matched only once during the entire timeout
+            self.assertEqual(find.call_count, 1)
+
+            find.reset_mock()
+            self.assertRaises(NotFindError, self.region.wait_vanish,
+                              Image('shape_blue_circle'), timeout=1)
+            self.assertEqual(find.call_count, 1)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_find_any(self) -> None:
+        screen = Image('all_shapes')
+        self.region.cv_backend = TemplateFinder()
+        with patch.object(self.region.dc_backend, "capture_screen",
+                          return_value=screen) as capture, \
+                patch.object(self.region.cv_backend, "find",
+                             wraps=self.region.cv_backend.find) as find:
+            targets = [Image('n_ibs'), 'shape_green_box', Image('shape_blue_circle')]
+            for workers in [1, 2]:
+                capture.reset_mock()
+                find.reset_mock()
+                all_matches = self.region.find_any(targets, workers=workers)
+                # a single screen capture is matched against all targets
+                self.assertEqual(capture.call_count, 1)
+                self.assertEqual(len(all_matches), 3)
+                self.assertEqual(len(all_matches[0]), 0)
+                self.assertEqual(len(all_matches[1]), 1)
+                self.assertAlmostEqual(all_matches[1][0].x, 20, delta=5)
+                self.assertAlmostEqual(all_matches[1][0].y, 180, delta=5)
+                self.assertEqual(len(all_matches[2]), 1)
+                self.assertAlmostEqual(all_matches[2][0].x, 104, delta=5)
+                self.assertAlmostEqual(all_matches[2][0].y, 10, delta=5)
+                self.assertEqual(self.region.last_match.x, all_matches[1][0].x)
+
+            find.reset_mock()
+            self.assertRaises(FindError, self.region.wait_any,
+                              [Image('n_ibs')], timeout=1)
+            # the same screen is matched only once during the entire timeout
+            self.assertEqual(find.call_count, 1)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_find_any_own_settings(self) -> None:
+        screen = Image('all_shapes')
+        targets = [Image('n_ibs', match_settings=TemplateFinder()),
+                   Image('shape_green_box', match_settings=TemplateFinder()),
+                   Image('shape_blue_circle', match_settings=TemplateFinder())]
+        # all targets have to be matched at the same time to pass the barrier
+        barrier = threading.Barrier(3, timeout=10)
+
+        def find_wrapper(finder: TemplateFinder) -> Any:
+            find = finder.find
+
+            def wrapped(*args: Any, **kwargs: Any) -> list[Match]:
+                barrier.wait()
+                return find(*args, **kwargs)
+            return wrapped
+
+        for target in targets:
+            target.match_settings.find = find_wrapper(target.match_settings)
+        with patch.object(self.region.dc_backend, "capture_screen",
+                          return_value=screen):
+            all_matches = self.region.find_any(targets, workers=3)
+        self.assertEqual(len(all_matches), 3)
+        self.assertEqual(len(all_matches[0]), 0)
+        self.assertEqual(len(all_matches[1]), 1)
+        self.assertAlmostEqual(all_matches[1][0].x, 20, delta=5)
+        self.assertAlmostEqual(all_matches[1][0].y, 180, delta=5)
+        self.assertEqual(len(all_matches[2]), 1)
+        self.assertAlmostEqual(all_matches[2][0].x, 104, delta=5)
+        self.assertAlmostEqual(all_matches[2][0].y, 10, delta=5)
+        for target, matches in zip(targets[1:], all_matches[1:]):
+            self.assertIs(matches[0].cv_backend, target.match_settings)
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_find_near_last_match(self) -> None:
+        screen = Image('all_shapes')
+
+        def capture_screen(*args: Any) -> Image:
+            if len(args) != 4:
+                return screen
+            x, y, w, h = args
+            window = screen.numpy_array[y:y + h, x:x + w]
+            return Image(numpy_array=window.copy())
+
+        self.region.cv_backend = TemplateFinder()
+        cv_find = self.region.cv_backend.find
+        with TemporaryConfig() as config, \
+                patch.object(self.region.dc_backend, "capture_screen",
+                             side_effect=capture_screen) as capture, \
+                patch.object(self.region.cv_backend, "find",
+                             wraps=self.region.cv_backend.find) as find:
+            config.search_near_last_match = True
+            with self.assertRaises(ValueError):
+                config.near_match_window_growth = 0.5
+            config.near_match_window_growth = 2.0
+            match = self.region.find('shape_blue_circle')
+            self.assertAlmostEqual(match.x, 104, delta=5)
+            self.assertAlmostEqual(match.y, 10, delta=5)
+            # no previous match to search near
+            self.assertEqual(capture.call_args_list[-1].args, (self.region,))
+
+            capture.reset_mock()
+            find.reset_mock()
+            match = self.region.find('shape_blue_circle')
+            self.assertAlmostEqual(match.x, 104, delta=5)
+            self.assertAlmostEqual(match.y, 10, delta=5)
+            # only a window around the previous match is captured and searched
+            self.assertEqual(capture.call_count, 1)
+            self.assertEqual(len(capture.call_args.args), 4)
+            self.assertEqual(find.call_count, 1)
+
+            # a moved target is still found in the entire region
+            key = self.region._target_key(Image('shape_blue_circle'))
+            self.region._last_locations[key] = (400, 300, 165, 151)
+            match = self.region.find('shape_blue_circle')
+            self.assertAlmostEqual(match.x, 104, delta=5)
+            self.assertAlmostEqual(match.y, 10, delta=5)
+            self.assertEqual(capture.call_args_list[-1].args, (self.region,))
+
+            # windows around small matches grow even with a small growth factor
+            # and only a limited number of them is searched before the fallback
+            config.near_match_window_growth = 1.01
+            self.region._last_locations[key] = (300, 200, 10, 10)
+            find.side_effect = lambda needle, haystack: (
+                cv_find(needle, haystack) if haystack is screen else [])
+            capture.reset_mock()
+            match = self.region.find('shape_blue_circle')
+            self.assertAlmostEqual(match.x, 104, delta=5)
+            self.assertAlmostEqual(match.y, 10, delta=5)
+            self.assertEqual(capture.call_count, 11)
+            widths = [call.args[2] for call in capture.call_args_list[:-1]]
+            self.assertEqual(widths, sorted(set(widths)))
+            self.assertEqual(capture.call_args_list[-1].args, (self.region,))
+
+    @unittest.skipIf(os.environ.get('DISABLE_OPENCV', "0") == "1", "Disabled OpenCV")
+    def test_find_atlas_match(self) -> None:
+        screen = Image('all_shapes')
+
+        def capture_screen(*args: Any) -> Image:
+            if len(args) != 4:
+                return screen
+            x, y, w, h = args
+            window = screen.numpy_array[y:y + h, x:x + w]
+            return Image(numpy_array=window.copy())
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.addCleanup(LocationAtlas._atlases.clear)
+        self.region.cv_backend = TemplateFinder()
+        with TemporaryConfig() as config, \
+                patch.object(self.region.dc_backend, "capture_screen",
+                             side_effect=capture_screen) as capture:
+            config.location_atlas = os.path.join(tmpdir, "atlas.json")
+            match = self.region.find('shape_blue_circle')
+            self.assertEqual(capture.call_args_list[-1].args, (self.region,))
+            self.assertTrue(os.path.exists(config.location_atlas))
+
+            # a new process would only have the persisted atlas
+            LocationAtlas._atlases.clear()
+            region = Region(dc=self.region.dc_backend, cv=self.region.cv_backend)
+            capture.reset_mock()
+            atlas_match = region.find('shape_blue_circle')
+            self.assertEqual((atlas_match.x, atlas_match.y), (match.x, match.y))
+            # only the previous match box is captured
+            self.assertEqual(capture.call_count, 1)
+            self.assertEqual(capture.call_args.args,
+                             (match.x, match.y, match.width, match.height))
+
+
 if __name__ == '__main__':
     unittest.main()
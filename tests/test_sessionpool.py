@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+# Copyright 2013-2018 Intranet AG and contributors
+#
+# guibot is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# guibot is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with guibot.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import common_test
+from guibot.sessionpool import SessionPool
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    @mock.patch("guibot.sessionpool.GuiBot")
+    def test_run(self, mock_guibot) -> None:
+        """Test that scripts run on all sessions with the given number of workers."""
+        mock_guibot.side_effect = lambda dc, cv: mock.MagicMock(dc_backend=dc)
+        controllers = [mock.MagicMock() for _ in range(4)]
+        cv = mock.MagicMock()
+        pool = SessionPool(controllers, cv=cv, workers=2)
+        self.assertEqual(len(pool.sessions), 4)
+        self.assertEqual(cv.copy.call_count, 4)
+
+        running = []
+        max_running = []
+        lock = threading.Lock()
+        all_busy = threading.Event()
+
+        def script(session):
+            with lock:
+                running.append(session)
+                max_running.append(len(running))
+                if len(running) == 2:
+                    all_busy.set()
+            # hold the session until all workers are busy so that they overlap
+            all_busy.wait(timeout=10)
+            time.sleep(0.01)
+            with lock:
+                running.remove(session)
+            if session.dc_backend is controllers[1]:
+                raise RuntimeError("failing session")
+            return session.dc_backend
+
+        results = pool.run(script, repeat=3)
+        self.assertEqual(max(max_running), 2)
+        for count in max_running:
+            self.assertLessEqual(count, 2)
+        self.assertEqual(results[0], controllers[0])
+        self.assertIsInstance(results[1], RuntimeError)
+
+        stats = pool.stats
+        self.assertEqual([s["runs"] for s in stats], [3, 3, 3, 3])
+        self.assertEqual([s["failures"] for s in stats], [0, 3, 0, 0])
+        for s in stats:
+            self.assertGreaterEqual(s["throughput"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
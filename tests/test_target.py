@@ -42,6 +42,30 @@ class ImageTest(unittest.TestCase):
         self.assertIsInstance(image.match_settings, Finder)
         self.assertFalse(image.use_own_settings)
 
+    def test_numpy_array(self) -> None:
+        """Test image target initialization and views from array data."""
+        import numpy
+        image = Image(self.file_all_shapes)
+        array = image.numpy_array
+        self.assertEqual((300, 400, 3), array.shape)
+        self.assertFalse(array.flags.writeable)
+        # views are created only once
+        self.assertIs(array, image.numpy_array)
+        self.assertIs(image.gray_array, image.gray_array)
+        self.assertEqual((300, 400), image.gray_array.shape)
+
+        cropped = numpy.ascontiguousarray(array[10:60, 20:100])
+        wrapped = Image("", numpy_array=cropped)
+        # the wrapped data is read-only without changing the original array
+        self.assertTrue(cropped.flags.writeable)
+        self.assertFalse(wrapped.numpy_array.flags.writeable)
+        self.assertTrue(numpy.shares_memory(cropped, wrapped.numpy_array))
+        self.assertEqual(80, wrapped.width)
+        self.assertEqual(50, wrapped.height)
+        self.assertEqual((80, 50), wrapped.pil_image.size)
+        self.assertIs(wrapped.pil_image, wrapped.pil_image)
+        numpy.testing.assert_array_equal(numpy.array(wrapped.pil_image), wrapped.numpy_array)
+
     def test_copy_object(self) -> None:
         """Test sane image target copying."""
         image = Image(self.file_all_shapes)
@@ -156,6 +180,26 @@ class ImageTest(unittest.TestCase):
         third_image = Image(self.file_all_shapes)
         self.assertIsNot(image.pil_image, third_image.pil_image)
 
+    def test_image_derived(self) -> None:
+        """Test image target caching for representations derived from the image data."""
+        image = Image(self.file_all_shapes)
+        compute = lambda: [image.width, image.height]
+        derived = image.derive("size", (1,), compute)
+        self.assertEqual(derived, [image.width, image.height])
+        self.assertIs(image.derive("size", (1,), compute), derived)
+        self.assertIsNot(image.derive("size", (2,), compute), derived)
+        self.assertIs(image.gray_array, image.gray_array)
+
+        # images loaded from the same cached file share derived representations
+        second_image = Image(self.file_all_shapes)
+        self.assertIs(second_image.derive("size", (1,), compute), derived)
+
+        # reloading the image data drops all derived representations
+        third_image = Image(self.file_all_shapes, use_cache=False)
+        self.assertIsNot(third_image.derive("size", (1,), compute), derived)
+        image.load(self.file_all_shapes, use_cache=False)
+        self.assertIsNot(image.derive("size", (1,), compute), derived)
+
 
 class ChainTest(unittest.TestCase):
     """Tests for the chain target (series of steps)."""